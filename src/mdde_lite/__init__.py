@@ -27,15 +27,86 @@ Repository: https://github.com/jacovanderlaan/mdde-demo
 __version__ = "0.5.0"
 __author__ = "Jaco van der Laan"
 
-from .schema import create_schema, get_schema_info
-from .optimizer import analyze_sql, analyze_file, analyze_directory, get_all_check_types
-from .diagrams import generate_erd, generate_dataflow, generate_lineage
-from .lineage import extract_lineage, ColumnLineage
-from .determinism import check_determinism, DeterminismIssue, suggest_tie_breakers
-from .dbt_generator import generate_dbt_project, generate_model_sql, DbtModel
-from .temporal import detect_scd_pattern, generate_scd2_merge, SCDPattern, SCDType
-from .documenter import generate_entity_docs, generate_lineage_doc
-from .cte_normalizer import normalize_to_ctes, suggest_cte_structure, NormalizationResult
-from .glossary import BusinessGlossary, GlossaryTerm, TermMapping
-from .datavault import detect_dv_construct, validate_dv_model, DVConstruct, DVConstructType
-from .dimensional import detect_dimensional_construct, generate_star_schema, DimensionalConstruct
+import importlib
+
+# Public names are imported on first access (PEP 562) so that importing a
+# single module does not pull in every submodule and its dependencies.
+# Unlike the former eager imports, __all__ limits "import *" to the names
+# below (importing all of them), and submodules such as mdde_lite.parser
+# are only imported when first accessed as attributes.
+_LAZY_IMPORTS = {
+    # schema
+    "create_schema": "schema",
+    "get_schema_info": "schema",
+    # optimizer
+    "analyze_sql": "optimizer",
+    "analyze_file": "optimizer",
+    "analyze_directory": "optimizer",
+    "get_all_check_types": "optimizer",
+    # diagrams
+    "generate_erd": "diagrams",
+    "generate_dataflow": "diagrams",
+    "generate_lineage": "diagrams",
+    # lineage
+    "extract_lineage": "lineage",
+    "ColumnLineage": "lineage",
+    # determinism
+    "check_determinism": "determinism",
+    "DeterminismIssue": "determinism",
+    "suggest_tie_breakers": "determinism",
+    # dbt_generator
+    "generate_dbt_project": "dbt_generator",
+    "generate_model_sql": "dbt_generator",
+    "DbtModel": "dbt_generator",
+    # temporal
+    "detect_scd_pattern": "temporal",
+    "generate_scd2_merge": "temporal",
+    "SCDPattern": "temporal",
+    "SCDType": "temporal",
+    # documenter
+    "generate_entity_docs": "documenter",
+    "generate_lineage_doc": "documenter",
+    # cte_normalizer
+    "normalize_to_ctes": "cte_normalizer",
+    "suggest_cte_structure": "cte_normalizer",
+    "NormalizationResult": "cte_normalizer",
+    # glossary
+    "BusinessGlossary": "glossary",
+    "GlossaryTerm": "glossary",
+    "TermMapping": "glossary",
+    # datavault
+    "detect_dv_construct": "datavault",
+    "validate_dv_model": "datavault",
+    "DVConstruct": "datavault",
+    "DVConstructType": "datavault",
+    # dimensional
+    "detect_dimensional_construct": "dimensional",
+    "generate_star_schema": "dimensional",
+    "DimensionalConstruct": "dimensional",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+# Submodules, also resolved on first attribute access
+_SUBMODULES = frozenset({
+    "schema", "parser", "optimizer", "generator", "diagrams", "lineage",
+    "determinism", "dbt_generator", "temporal", "documenter",
+    "cte_normalizer", "glossary", "datavault", "dimensional",
+})
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        # import_module binds the submodule on this package as well
+        return importlib.import_module(f".{name}", __name__)
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS) | _SUBMODULES)
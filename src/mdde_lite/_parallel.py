@@ -0,0 +1,46 @@
+"""
+MDDE Lite - Process-pool helper for the batch APIs
+
+Shared by check_determinism_batch and normalize_many, which both run a
+pure function over many independent SQL strings.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, TypeVar
+import os
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Smallest batch worth sending to worker processes: below this, starting a
+# pool costs more than running the items in-process
+MIN_PARALLEL_BATCH = 8
+
+# Chunks handed out per worker: more balances uneven items better, fewer
+# saves inter-process round-trips
+CHUNKS_PER_WORKER = 4
+
+
+def map_in_processes(
+    func: Callable[[T], R],
+    items: List[T],
+    workers: Optional[int] = None
+) -> List[R]:
+    """
+    Apply func to every item, in worker processes for large enough batches.
+
+    Args:
+        func: Picklable (module-level) function
+        items: Inputs, processed independently
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        func(item) per item, in input order
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(items) < MIN_PARALLEL_BATCH:
+        return [func(item) for item in items]
+
+    chunksize = max(1, len(items) // (workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
@@ -21,13 +21,59 @@ This is a simplified version. The full MDDE framework includes:
 
 import sqlglot
 from sqlglot import exp
-from typing import List, Dict, Optional, Set, Tuple
+from typing import List, Dict, Iterable, Iterator, Optional, Set, Tuple
 from dataclasses import dataclass, field
-from collections import OrderedDict
+from collections import Counter
+from functools import lru_cache
+from operator import attrgetter
+import io
 import re
 
+from ._parallel import map_in_processes
 
-@dataclass
+
+# Compiled once for the naming helpers below
+_SPLIT_WORDS = re.compile(r'[_\s]+')
+_CLEAN_IDENT = re.compile(r'[^a-zA-Z0-9_]')
+
+# Aggregate functions by sqlglot expression key (lower-case class tag)
+_AGG_KEYS = frozenset({"sum", "count", "avg", "max", "min"})
+
+# CTE name hints by the clause a subquery appears in (these have no subclasses)
+_PARENT_HINTS = {exp.From: "source", exp.Join: "joined", exp.Where: "filter"}
+
+# Projection name extractors by exact expression type
+_COLUMN_NAME_GETTERS = {
+    exp.Alias: attrgetter("alias"),
+    exp.Column: attrgetter("name"),
+    exp.Star: lambda expr: "*",
+}
+
+
+@lru_cache(maxsize=1024)
+def _parse_one(sql: str) -> exp.Expression:
+    """Parse SQL once per distinct input string."""
+    return sqlglot.parse_one(sql)
+
+
+def _parse_cached(sql: str) -> exp.Expression:
+    """
+    Parse SQL using a shared cache.
+
+    Returns a copy of the cached AST so callers can mutate it freely.
+    Use ``_parse_one.cache_clear()`` (and ``_pretty_sql.cache_clear()``)
+    to drop cached trees.
+    """
+    return _parse_one(sql).copy()
+
+
+@lru_cache(maxsize=1024)
+def _pretty_sql(sql: str) -> str:
+    """Pretty-print SQL once per distinct input string."""
+    return _parse_one(sql).sql(pretty=True)
+
+
+@dataclass(slots=True)
 class CTEDefinition:
     """Represents a Common Table Expression."""
     name: str
@@ -37,7 +83,7 @@ class CTEDefinition:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class NormalizationResult:
     """Result of CTE normalization."""
     original_sql: str
@@ -68,7 +114,7 @@ def normalize_to_ctes(
         NormalizationResult with normalized SQL and metadata
     """
     try:
-        parsed = sqlglot.parse_one(sql)
+        parsed = _parse_cached(sql)
     except Exception as e:
         return NormalizationResult(
             original_sql=sql,
@@ -78,6 +124,20 @@ def normalize_to_ctes(
             transformations=[f"Parse error: {e}"]
         )
 
+    return _normalize_to_ctes_inner(
+        parsed, sql, cte_prefix, extract_subqueries, extract_repeated, min_subquery_depth
+    )
+
+
+def _normalize_to_ctes_inner(
+    parsed: exp.Expression,
+    sql: str,
+    cte_prefix: str = "cte_",
+    extract_subqueries: bool = True,
+    extract_repeated: bool = True,
+    min_subquery_depth: int = 1
+) -> NormalizationResult:
+    """Normalize an already-parsed (and unmodified) query; see normalize_to_ctes."""
     transformations = []
     cte_definitions = []
     cte_counter = [0]  # Use list for mutable counter in nested function
@@ -86,34 +146,25 @@ def normalize_to_ctes(
         cte_counter[0] += 1
         if hint:
             # Clean hint for valid identifier
-            clean_hint = re.sub(r'[^a-zA-Z0-9_]', '_', hint.lower())[:20]
+            clean_hint = _CLEAN_IDENT.sub('_', hint.lower())[:20]
             return f"{cte_prefix}{clean_hint}_{cte_counter[0]}"
         return f"{cte_prefix}{cte_counter[0]}"
 
+    # Collect CTEs, subqueries and table references in a single walk
+    ctes, subqueries, table_refs = _collect_structure(parsed)
+
     # Extract existing CTEs
     existing_ctes = {}
-    for cte in parsed.find_all(exp.CTE):
+    for cte in ctes:
         cte_name = cte.alias
         if cte_name:
             existing_ctes[cte_name] = cte.this.sql()
 
     # Find and extract subqueries
-    new_ctes = OrderedDict()
+    new_ctes: Dict[str, CTEDefinition] = {}
 
     if extract_subqueries:
-        subqueries = list(parsed.find_all(exp.Subquery))
-
-        for i, subquery in enumerate(subqueries):
-            # Skip if it's a scalar subquery in SELECT
-            parent = subquery.parent
-            if isinstance(parent, exp.Select):
-                continue
-
-            # Get the inner query
-            inner = subquery.this
-            if not isinstance(inner, exp.Select):
-                continue
-
+        for i, subquery, inner in _iter_extractable_subqueries(subqueries):
             # Generate CTE name based on context
             hint = _get_subquery_hint(subquery)
             cte_name = generate_cte_name(hint)
@@ -133,15 +184,14 @@ def normalize_to_ctes(
 
     # Find repeated table references that could be CTEd
     if extract_repeated:
-        table_refs = _find_repeated_table_patterns(parsed)
         for pattern, count in table_refs.items():
             if count > 1:
                 transformations.append(
                     f"Found repeated pattern '{pattern}' ({count} times) - consider extracting to CTE"
                 )
 
-    # Build normalized SQL
-    normalized_sql = _build_normalized_sql(parsed, new_ctes, existing_ctes)
+    # Build normalized SQL (the tree is unmodified, so reuse the cached serialization)
+    normalized_sql = _build_normalized_sql(_pretty_sql(sql), new_ctes, existing_ctes)
 
     # Convert to CTEDefinition list
     cte_definitions = list(new_ctes.values())
@@ -155,6 +205,27 @@ def normalize_to_ctes(
     )
 
 
+def _iter_extractable_subqueries(
+    subqueries: Iterable[exp.Subquery]
+) -> Iterator[Tuple[int, exp.Subquery, exp.Select]]:
+    """
+    Lazily yield (position, subquery, inner SELECT) for subqueries worth extracting.
+
+    Scalar subqueries in a SELECT list and non-SELECT bodies (e.g. UNIONs)
+    are skipped before any naming or column extraction work.
+    """
+    Select = exp.Select
+    for i, subquery in enumerate(subqueries):
+        # Skip if it's a scalar subquery in SELECT
+        if isinstance(subquery.parent, Select):
+            continue
+
+        # Get the inner query
+        inner = subquery.this
+        if isinstance(inner, Select):
+            yield i, subquery, inner
+
+
 def _get_subquery_hint(subquery: exp.Subquery) -> str:
     """Generate a hint for CTE naming based on subquery context."""
     # Check for alias
@@ -162,20 +233,16 @@ def _get_subquery_hint(subquery: exp.Subquery) -> str:
         return subquery.alias
 
     # Check parent context
-    parent = subquery.parent
-    if isinstance(parent, exp.From):
-        return "source"
-    elif isinstance(parent, exp.Join):
-        return "joined"
-    elif isinstance(parent, exp.Where):
-        return "filter"
+    hint = _PARENT_HINTS.get(type(subquery.parent))
+    if hint:
+        return hint
 
     # Check for table references in the subquery
     inner = subquery.this
     if isinstance(inner, exp.Select):
-        tables = list(inner.find_all(exp.Table))
-        if tables:
-            return tables[0].name
+        first_table = next(inner.find_all(exp.Table), None)
+        if first_table is not None:
+            return first_table.name
 
     return "subq"
 
@@ -184,50 +251,66 @@ def _extract_select_columns(select: exp.Select) -> List[str]:
     """Extract column names/aliases from SELECT clause."""
     columns = []
     for expr in select.expressions:
-        if isinstance(expr, exp.Alias):
-            columns.append(expr.alias)
-        elif isinstance(expr, exp.Column):
-            columns.append(expr.name)
-        elif isinstance(expr, exp.Star):
-            columns.append("*")
+        get_name = _COLUMN_NAME_GETTERS.get(type(expr))
+        if get_name is not None:
+            columns.append(get_name(expr))
         else:
             # For expressions, try to get a reasonable name
-            columns.append(str(expr)[:30])
+            columns.append(expr.sql()[:30])
     return columns
 
 
-def _find_repeated_table_patterns(parsed: exp.Expression) -> Dict[str, int]:
-    """Find repeated table access patterns."""
-    patterns = {}
+def _collect_structure(
+    parsed: exp.Expression
+) -> Tuple[List[exp.CTE], List[exp.Subquery], Dict[str, int]]:
+    """
+    Collect CTEs, subqueries and table access counts in one AST walk.
+
+    Nodes are returned in the same (breadth-first) order as ``find_all``.
+    """
+    ctes = []
+    subqueries = []
+    patterns = Counter()
+    Table, Subquery, CTE = exp.Table, exp.Subquery, exp.CTE  # local lookups in the hot loop
 
-    for table in parsed.find_all(exp.Table):
-        table_name = table.name
-        if table_name:
-            patterns[table_name] = patterns.get(table_name, 0) + 1
+    for node in parsed.walk():
+        if isinstance(node, Table):
+            table_name = node.name
+            if table_name:
+                patterns[table_name] += 1
+        elif isinstance(node, Subquery):
+            subqueries.append(node)
+        elif isinstance(node, CTE):
+            ctes.append(node)
 
-    return patterns
+    return ctes, subqueries, patterns
 
 
 def _build_normalized_sql(
-    parsed: exp.Expression,
+    main_query: str,
     new_ctes: Dict[str, CTEDefinition],
     existing_ctes: Dict[str, str]
 ) -> str:
-    """Build the normalized SQL with CTEs."""
+    """Build the normalized SQL with CTEs around the pretty-printed main query."""
     if not new_ctes:
-        return parsed.sql(pretty=True)
-
-    # Build CTE block
-    cte_parts = []
-    for cte_name, cte_def in new_ctes.items():
-        cte_parts.append(f"{cte_name} AS (\n    {cte_def.sql}\n)")
+        return main_query
 
-    cte_block = "WITH " + ",\n".join(cte_parts)
+    # Write the CTE block and main query into one buffer
+    buf = io.StringIO()
+    buf.write("WITH ")
+    for i, (cte_name, cte_def) in enumerate(new_ctes.items()):
+        if i:
+            buf.write(",\n")
+        buf.write(cte_name)
+        buf.write(" AS (\n    ")
+        buf.write(cte_def.sql)
+        buf.write("\n)")
 
-    # Get the main query (simplified - in full version would replace subqueries)
-    main_query = parsed.sql(pretty=True)
+    # Main query is kept as-is (simplified - in full version would replace subqueries)
+    buf.write("\n\n")
+    buf.write(main_query)
 
-    return f"{cte_block}\n\n{main_query}"
+    return buf.getvalue()
 
 
 def flatten_nested_subqueries(
@@ -245,7 +328,7 @@ def flatten_nested_subqueries(
         NormalizationResult with flattened SQL
     """
     try:
-        parsed = sqlglot.parse_one(sql)
+        parsed = _parse_cached(sql)
     except Exception as e:
         return NormalizationResult(
             original_sql=sql,
@@ -258,17 +341,8 @@ def flatten_nested_subqueries(
     transformations = []
     cte_definitions = []
 
-    # Find nesting depth
-    def get_depth(node: exp.Expression, current: int = 0) -> int:
-        max_found = current
-        if isinstance(node, (exp.Subquery, exp.Select)):
-            current += 1
-        for child in node.iter_expressions():
-            child_depth = get_depth(child, current)
-            max_found = max(max_found, child_depth)
-        return max_found
-
-    depth = get_depth(parsed)
+    # Find nesting depth (the exact value is reported either way)
+    depth = _nesting_depth(parsed)
 
     if depth > max_depth:
         transformations.append(
@@ -276,19 +350,34 @@ def flatten_nested_subqueries(
         )
         transformations.append("Consider extracting inner queries to CTEs")
 
-        # Extract deepest subqueries first
-        result = normalize_to_ctes(sql, min_subquery_depth=max_depth)
+        # Extract deepest subqueries first (reusing the tree parsed above)
+        result = _normalize_to_ctes_inner(parsed, sql, min_subquery_depth=max_depth)
         return result
 
     return NormalizationResult(
         original_sql=sql,
-        normalized_sql=parsed.sql(pretty=True),
+        normalized_sql=_pretty_sql(sql),
         ctes_extracted=0,
         cte_definitions=[],
         transformations=[f"Nesting depth {depth} is acceptable (max: {max_depth})"]
     )
 
 
+def _nesting_depth(root: exp.Expression) -> int:
+    """Maximum SELECT/subquery nesting depth, via iterative DFS."""
+    max_found = 0
+    nesting_types = (exp.Subquery, exp.Select)
+    stack = [(root, 0)]
+    while stack:
+        node, current = stack.pop()
+        if current > max_found:
+            max_found = current
+        if isinstance(node, nesting_types):
+            current += 1
+        stack.extend((child, current) for child in node.iter_expressions())
+    return max_found
+
+
 def standardize_cte_names(
     sql: str,
     naming_convention: str = "snake_case",
@@ -303,10 +392,12 @@ def standardize_cte_names(
         prefix: Optional prefix to add to all CTE names
 
     Returns:
-        SQL with standardized CTE names
+        SQL with standardized CTE names. When anything is renamed, the query
+        is regenerated from its AST on a single line (keywords upper-cased),
+        so the input's layout is not preserved; otherwise sql is returned as-is.
     """
     try:
-        parsed = sqlglot.parse_one(sql)
+        parsed = _parse_cached(sql)
     except:
         return sql
 
@@ -318,42 +409,80 @@ def standardize_cte_names(
         if old_name:
             new_name = _apply_naming_convention(old_name, naming_convention, prefix)
             if new_name != old_name:
-                cte_renames[old_name] = new_name
+                cte_renames[old_name.lower()] = new_name
 
     if not cte_renames:
         return sql
 
-    # Apply renames (simplified - would need full AST transformation in production)
-    result = sql
-    for old_name, new_name in cte_renames.items():
-        # Replace CTE definition
-        result = re.sub(
-            rf'\b{old_name}\s+AS\s*\(',
-            f'{new_name} AS (',
-            result,
-            flags=re.IGNORECASE
-        )
-        # Replace CTE references
-        result = re.sub(
-            rf'\bFROM\s+{old_name}\b',
-            f'FROM {new_name}',
-            result,
-            flags=re.IGNORECASE
-        )
-        result = re.sub(
-            rf'\bJOIN\s+{old_name}\b',
-            f'JOIN {new_name}',
-            result,
-            flags=re.IGNORECASE
-        )
+    # Rewrite CTE definitions and every reference to them in the AST
+    scope_aliases: Dict[int, Set[str]] = {}
+    renamed = parsed.transform(
+        lambda node: _rename_cte_reference(node, cte_renames, scope_aliases),
+        copy=False,
+    )
 
-    return result
+    return renamed.sql()
+
+
+def _source_aliases(select: exp.Select) -> Set[str]:
+    """Lower-case aliases of the tables and subqueries a SELECT reads from."""
+    aliases = set()
+    # The FROM arg is "from_" in newer sqlglot releases, "from" in older ones
+    from_ = select.args.get("from_") or select.args.get("from")
+    for source in (from_, *(select.args.get("joins") or ())):
+        if source is not None and source.this is not None and source.this.alias:
+            aliases.add(source.this.alias.lower())
+    return aliases
+
+
+def _qualifier_is_alias(column: exp.Column, scope_aliases: Dict[int, Set[str]]) -> bool:
+    """Whether a column's qualifier names a source alias in an enclosing SELECT."""
+    qualifier = column.table.lower()
+    select = column.find_ancestor(exp.Select)
+    while select is not None:
+        aliases = scope_aliases.get(id(select))
+        if aliases is None:
+            aliases = scope_aliases[id(select)] = _source_aliases(select)
+        if qualifier in aliases:
+            return True
+        select = select.find_ancestor(exp.Select)
+    return False
+
+
+def _rename_cte_reference(
+    node: exp.Expression,
+    renames: Dict[str, str],
+    scope_aliases: Dict[int, Set[str]]
+) -> exp.Expression:
+    """
+    Rename a CTE definition, table reference or column qualifier.
+
+    Column qualifiers that name a table alias (e.g. ``FROM x AS CustData``)
+    shadow the CTE and are left alone. scope_aliases caches each SELECT's
+    source aliases by id.
+    """
+    if isinstance(node, exp.CTE):
+        new_name = renames.get(node.alias.lower())
+        if new_name:
+            node.args["alias"].set("this", exp.to_identifier(new_name))
+    elif isinstance(node, exp.Table):
+        # Qualified names (schema.table) never refer to a CTE
+        if not node.args.get("db"):
+            new_name = renames.get(node.name.lower())
+            if new_name:
+                node.set("this", exp.to_identifier(new_name))
+    elif isinstance(node, exp.Column):
+        new_name = renames.get(node.table.lower())
+        if (new_name and not node.args.get("db")
+                and not _qualifier_is_alias(node, scope_aliases)):
+            node.set("table", exp.to_identifier(new_name))
+    return node
 
 
 def _apply_naming_convention(name: str, convention: str, prefix: str) -> str:
     """Apply naming convention to a name."""
     # Split into words
-    words = re.split(r'[_\s]+', name)
+    words = _SPLIT_WORDS.split(name)
     words = [w for w in words if w]
 
     if not words:
@@ -387,25 +516,49 @@ def suggest_cte_structure(sql: str) -> List[str]:
     suggestions = []
 
     try:
-        parsed = sqlglot.parse_one(sql)
+        parsed = _parse_cached(sql)
     except:
         suggestions.append("Could not parse SQL")
         return suggestions
 
+    # Gather all structural counts in a single walk
+    cte_count = 0
+    subquery_count = 0
+    agg_count = 0
+    union_count = 0
+    table_counts = Counter()
+    Table, Subquery, CTE, Union, Func = exp.Table, exp.Subquery, exp.CTE, exp.Union, exp.Func
+
+    for node in parsed.walk():
+        if isinstance(node, Table):
+            name = node.name
+            if name:
+                table_counts[name] += 1
+        elif isinstance(node, Subquery):
+            subquery_count += 1
+        elif isinstance(node, CTE):
+            cte_count += 1
+        elif isinstance(node, Union):
+            union_count += 1
+        elif isinstance(node, Func):
+            if node.key in _AGG_KEYS:
+                agg_count += 1
+
     # Check for existing CTEs
-    existing_ctes = list(parsed.find_all(exp.CTE))
-    if existing_ctes:
-        suggestions.append(f"Query already has {len(existing_ctes)} CTE(s)")
-
-    # Check nesting depth
-    def count_subquery_depth(node, depth=0):
-        max_depth = depth
-        if isinstance(node, exp.Subquery):
-            depth += 1
-            max_depth = depth
-        for child in node.iter_expressions():
-            child_depth = count_subquery_depth(child, depth)
-            max_depth = max(max_depth, child_depth)
+    if cte_count:
+        suggestions.append(f"Query already has {cte_count} CTE(s)")
+
+    # Check nesting depth (iterative DFS - deep nesting must not hit the recursion limit)
+    def count_subquery_depth(root):
+        max_depth = 0
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if isinstance(node, Subquery):
+                depth += 1
+                if depth > max_depth:
+                    max_depth = depth
+            stack.extend((child, depth) for child in node.iter_expressions())
         return max_depth
 
     depth = count_subquery_depth(parsed)
@@ -415,12 +568,6 @@ def suggest_cte_structure(sql: str) -> List[str]:
         )
 
     # Check for repeated table references
-    table_counts = {}
-    for table in parsed.find_all(exp.Table):
-        name = table.name
-        if name:
-            table_counts[name] = table_counts.get(name, 0) + 1
-
     for table, count in table_counts.items():
         if count > 2:
             suggestions.append(
@@ -428,25 +575,18 @@ def suggest_cte_structure(sql: str) -> List[str]:
             )
 
     # Check for subqueries in FROM/JOIN
-    subquery_count = len(list(parsed.find_all(exp.Subquery)))
     if subquery_count > 0:
         suggestions.append(
             f"Found {subquery_count} subquery(s): Consider extracting to named CTEs"
         )
 
     # Check for complex aggregations
-    agg_count = 0
-    for func in parsed.find_all(exp.Func):
-        if func.sql_name().upper() in ("SUM", "COUNT", "AVG", "MAX", "MIN"):
-            agg_count += 1
-
     if agg_count > 3:
         suggestions.append(
             f"Multiple aggregations ({agg_count}): Consider staging CTE for base data"
         )
 
     # Check for UNION/UNION ALL
-    union_count = len(list(parsed.find_all(exp.Union)))
     if union_count > 0:
         suggestions.append(
             f"Found {union_count} UNION(s): Consider CTEs for each branch"
@@ -458,6 +598,23 @@ def suggest_cte_structure(sql: str) -> List[str]:
     return suggestions
 
 
+def normalize_many(
+    sqls: List[str],
+    workers: Optional[int] = None
+) -> List[NormalizationResult]:
+    """
+    Normalize many independent SQL queries in parallel.
+
+    Args:
+        sqls: SQL queries to normalize (e.g. one per file)
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        NormalizationResult per query, in input order
+    """
+    return map_in_processes(normalize_to_ctes, sqls, workers)
+
+
 if __name__ == "__main__":
     print("MDDE Lite - CTE Normalizer Demo")
     print("=" * 60)
@@ -18,9 +18,11 @@ This is a simplified version. The full MDDE framework includes:
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set, Tuple
-from enum import Enum
+from typing import Iterator, List, Dict, Optional, Set, Tuple
+from enum import Enum, IntEnum
+from functools import lru_cache
 import re
+import sys
 
 
 class DVConstructType(Enum):
@@ -34,7 +36,26 @@ class DVConstructType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+class _ColumnRole(IntEnum):
+    """Column roles as ints for the detection hot path (DVColumn.role keeps the name)."""
+    HASH_KEY = 0
+    BUSINESS_KEY = 1
+    LOAD_DATE = 2
+    RECORD_SOURCE = 3
+    HASH_DIFF = 4
+    VALID_FROM = 5
+    VALID_TO = 6
+    FK = 7
+    ATTRIBUTE = 8
+
+
+# Role name per _ColumnRole value, e.g. _ROLE_NAMES[_ColumnRole.FK] == "fk".
+# Interned, so every DVColumn shares one string per role and comparisons
+# against literals like "attribute" hit the identity fast path.
+_ROLE_NAMES = tuple(sys.intern(role.name.lower()) for role in _ColumnRole)
+
+
+@dataclass(slots=True)
 class DVColumn:
     """Represents a column in a Data Vault table."""
     name: str
@@ -43,7 +64,7 @@ class DVColumn:
     is_primary_key: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class DVConstruct:
     """Detected Data Vault construct."""
     name: str
@@ -60,7 +81,10 @@ class DVConstruct:
     recommendations: List[str] = field(default_factory=list)
 
 
-# Common Data Vault column patterns
+# Common Data Vault column patterns. DV_PATTERNS and DV_TABLE_PATTERNS are
+# public and stay lists of regexes for existing callers; detection uses
+# immutable lookups (_ROLE_RULES, _TABLE_PREFIXES, ...) built from them at
+# import, so edits made after import are not picked up.
 DV_PATTERNS = {
     "hash_key": [
         r"^h[kK]_", r".*_hk$", r".*_hash$", r"^hash_",
@@ -113,6 +137,143 @@ DV_TABLE_PATTERNS = {
 }
 
 
+def _expand_literals(body: str) -> Optional[List[str]]:
+    """
+    Expand a pattern body made of literals, ``[abc]`` classes and ``?``.
+
+    e.g. "load_d[at]te?" -> ["load_date", "load_dat", "load_dtte", "load_dtt"].
+    Returns None if the body uses any other regex syntax.
+    """
+    variants = [""]
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == "[":
+            end = body.find("]", i)
+            options = body[i + 1:end] if end > i else ""
+            if not options or re.escape(options) != options:
+                return None
+            i = end + 1
+        elif re.escape(char) == char:
+            options = char
+            i += 1
+        else:
+            return None
+
+        if i < len(body) and body[i] == "?":
+            options = tuple(options) + ("",)
+            i += 1
+        variants = [v + option for v in variants for option in options]
+    return variants
+
+
+def _split_literal_patterns(
+    patterns: List[str]
+) -> Tuple[frozenset, Tuple[str, ...], Tuple[str, ...], Optional[re.Pattern]]:
+    """
+    Split a role's patterns into exact names, prefixes and suffixes.
+
+    Literals may use simple ``[abc]`` classes and ``?`` (see _expand_literals).
+    Any other pattern is kept in one compiled alternation for re.search.
+    """
+    exact, prefixes, suffixes, irregular = set(), [], [], []
+    for pattern in patterns:
+        if pattern.startswith("^") and pattern.endswith("$"):
+            body, bucket = pattern[1:-1], exact
+        elif pattern.startswith("^"):
+            body, bucket = pattern[1:], prefixes
+        elif pattern.endswith("$"):
+            body, bucket = pattern[:-1], suffixes
+            if body.startswith(".*"):
+                body = body[2:]
+        else:
+            body, bucket = None, None
+
+        literals = _expand_literals(body) if body is not None else None
+        if literals is None:
+            irregular.append(pattern)
+        elif bucket is exact:
+            exact.update(literals)
+        else:
+            bucket.extend(literals)
+
+    regex = re.compile("|".join(f"(?:{p})" for p in irregular)) if irregular else None
+    return frozenset(exact), tuple(prefixes), tuple(suffixes), regex
+
+
+# Role rules in DV_PATTERNS order; string tests first, regex only when needed
+_ROLE_RULES = tuple(
+    (_ColumnRole[role.upper()], *_split_literal_patterns(patterns))
+    for role, patterns in DV_PATTERNS.items()
+)
+
+
+def _build_table_tokens() -> Tuple[
+    Dict[str, DVConstructType],
+    Dict[str, DVConstructType],
+    Tuple[Tuple[DVConstructType, re.Pattern], ...],
+]:
+    """
+    Turn DV_TABLE_PATTERNS (``^token_`` / ``_token$``) into token lookups.
+
+    The first construct type listed for a token wins, as in the pattern order.
+    Patterns of any other shape are kept as one regex per construct type.
+    """
+    prefixes, suffixes, irregular = {}, {}, {}
+    for construct_type, patterns in DV_TABLE_PATTERNS.items():
+        for pattern in patterns:
+            if pattern.startswith("^") and pattern.endswith("_"):
+                token, bucket = pattern[1:-1], prefixes
+            elif pattern.startswith("_") and pattern.endswith("$"):
+                token, bucket = pattern[1:-1], suffixes
+            else:
+                token, bucket = "", None
+            if not token or "_" in token or re.escape(token) != token:
+                irregular.setdefault(construct_type, []).append(pattern)
+            else:
+                bucket.setdefault(token, construct_type)
+    regexes = tuple(
+        (construct_type, re.compile("|".join(f"(?:{p})" for p in patterns)))
+        for construct_type, patterns in irregular.items()
+    )
+    return prefixes, suffixes, regexes
+
+
+# Table name tokens: first and last "_"-separated part of the name, plus
+# regexes for any patterns that are not a plain token
+_TABLE_PREFIXES, _TABLE_SUFFIXES, _TABLE_REGEXES = _build_table_tokens()
+_TABLE_TYPE_RANK = {construct_type: i for i, construct_type in enumerate(DV_TABLE_PATTERNS)}
+
+_HUB_FK_PATTERN = re.compile(r"^hk_")
+_LINKED_HUB_PATTERN = re.compile(r"^hk_(\w+)$")
+
+
+def _score_table(weights: Tuple[float, ...]) -> Tuple[float, ...]:
+    """
+    Precompute column confidence for every combination of present columns.
+
+    Bit i of the index means weights[i] applies; weights are summed in
+    order, giving exactly the floats of the equivalent if/+= chain.
+    """
+    scores = []
+    for mask in range(1 << len(weights)):
+        score = 0.0
+        for bit, weight in enumerate(weights):
+            if mask & (1 << bit):
+                score += weight
+        scores.append(score)
+    return tuple(scores)
+
+
+# Column confidence lookup tables, bits in the order of the weights:
+# hub: hash_key, business_keys, load_date, record_source
+_HUB_SCORES = _score_table((0.3, 0.3, 0.2, 0.2))
+# link: hash_key, 2+ linked hubs, exactly 1 linked hub, load_date, record_source
+_LINK_SCORES = _score_table((0.25, 0.35, 0.15, 0.2, 0.2))
+# satellite: hash_key, load_date, hash_diff, record_source
+_SAT_SCORES = _score_table((0.25, 0.25, 0.25, 0.25))
+
+
 def detect_dv_construct(
     table_name: str,
     columns: List[Dict[str, any]],
@@ -132,17 +293,7 @@ def detect_dv_construct(
     table_lower = table_name.lower()
 
     # Detect type from table name
-    detected_type = DVConstructType.UNKNOWN
-    name_confidence = 0.0
-
-    for construct_type, patterns in DV_TABLE_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, table_lower):
-                detected_type = construct_type
-                name_confidence = 0.8
-                break
-        if detected_type != DVConstructType.UNKNOWN:
-            break
+    detected_type, name_confidence = _classify_table(table_lower)
 
     # Analyze columns
     dv_columns = []
@@ -151,46 +302,50 @@ def detect_dv_construct(
     load_date = None
     record_source = None
     hash_diff = None
-    linked_hubs = []
+    hub_fk_columns = []  # (column, hub) for non-PK hk_* columns
+    attr_count = 0
 
-    for col in columns:
-        col_name = col.get("name", "").lower()
-        col_type = col.get("data_type", "")
-        is_pk = col.get("is_primary_key", False)
+    # Each column's name is read and lower-cased exactly once
+    column_items = (
+        (col.get("name", "").lower(), col.get("data_type", ""), col.get("is_primary_key", False))
+        for col in columns
+    )
 
-        role = _detect_column_role(col_name)
+    for col_name, col_type, is_pk in column_items:
+        role = _classify_column(col_name)
 
         dv_columns.append(DVColumn(
             name=col_name,
             data_type=col_type,
-            role=role,
+            role=_ROLE_NAMES[role],
             is_primary_key=is_pk
         ))
 
-        if role == "hash_key":
+        if role == _ColumnRole.HASH_KEY:
             # First hash key found (usually PK) is THE hash key
             if hash_key is None and is_pk:
                 hash_key = col_name
             elif hash_key is None:
                 hash_key = col_name
-        elif role == "business_key":
+        elif role == _ColumnRole.BUSINESS_KEY:
             business_keys.append(col_name)
-        elif role == "load_date":
+        elif role == _ColumnRole.LOAD_DATE:
             load_date = col_name
-        elif role == "record_source":
+        elif role == _ColumnRole.RECORD_SOURCE:
             record_source = col_name
-        elif role == "hash_diff":
+        elif role == _ColumnRole.HASH_DIFF:
             hash_diff = col_name
+        elif role == _ColumnRole.ATTRIBUTE:
+            attr_count += 1
 
-    # Second pass: detect linked hubs from non-PK hash key columns
-    for col in columns:
-        col_name = col.get("name", "").lower()
-        is_pk = col.get("is_primary_key", False)
-
-        if col_name.startswith("hk_") and col_name != hash_key and not is_pk:
-            hub_match = re.search(r"^hk_(\w+)$", col_name)
+        # Candidate link to a hub; the table's own hash key is excluded below
+        if not is_pk and col_name.startswith("hk_"):
+            hub_match = _LINKED_HUB_PATTERN.search(col_name)
             if hub_match:
-                linked_hubs.append(hub_match.group(1))
+                hub_fk_columns.append((col_name, hub_match.group(1)))
+
+    # Linked hubs: non-PK hash key columns other than the table's hash key
+    linked_hubs = [hub for name, hub in hub_fk_columns if name != hash_key]
 
     # Validate and adjust detection
     issues = []
@@ -198,61 +353,44 @@ def detect_dv_construct(
     column_confidence = 0.0
 
     if detected_type == DVConstructType.HUB:
-        if hash_key:
-            column_confidence += 0.3
-        else:
+        column_confidence = _HUB_SCORES[
+            bool(hash_key) | bool(business_keys) << 1
+            | bool(load_date) << 2 | bool(record_source) << 3
+        ]
+
+        if not hash_key:
             issues.append("Hub missing hash key column")
             recommendations.append("Add hash key column (e.g., hk_customer)")
 
-        if business_keys:
-            column_confidence += 0.3
-        else:
+        if not business_keys:
             issues.append("Hub missing business key column(s)")
             recommendations.append("Add business key column(s)")
 
-        if load_date:
-            column_confidence += 0.2
-        else:
+        if not load_date:
             issues.append("Missing load_date column")
             recommendations.append("Add load_date or ldts column")
 
-        if record_source:
-            column_confidence += 0.2
-        else:
+        if not record_source:
             issues.append("Missing record_source column")
             recommendations.append("Add record_source or rsrc column")
 
     elif detected_type == DVConstructType.LINK:
-        if hash_key:
-            column_confidence += 0.25
+        hub_count = len(linked_hubs)
+        column_confidence = _LINK_SCORES[
+            bool(hash_key) | (hub_count >= 2) << 1 | (hub_count == 1) << 2
+            | bool(load_date) << 3 | bool(record_source) << 4
+        ]
 
-        if len(linked_hubs) >= 2:
-            column_confidence += 0.35
-        elif len(linked_hubs) == 1:
-            column_confidence += 0.15
+        if hub_count == 1:
             issues.append("Link should connect at least 2 Hubs")
 
-        if load_date:
-            column_confidence += 0.2
-
-        if record_source:
-            column_confidence += 0.2
-
     elif detected_type == DVConstructType.SATELLITE:
-        if hash_key:
-            column_confidence += 0.25
-
-        if load_date:
-            column_confidence += 0.25
-
-        if hash_diff:
-            column_confidence += 0.25
-
-        if record_source:
-            column_confidence += 0.25
+        column_confidence = _SAT_SCORES[
+            bool(hash_key) | bool(load_date) << 1
+            | bool(hash_diff) << 2 | bool(record_source) << 3
+        ]
 
         # Satellites should have descriptive attributes
-        attr_count = sum(1 for c in dv_columns if c.role == "attribute")
         if attr_count == 0:
             issues.append("Satellite has no descriptive attributes")
 
@@ -295,20 +433,95 @@ def detect_dv_construct(
     )
 
 
+def detect_dv_constructs_batch(
+    tables: List[Dict[str, any]],
+    strict: bool = False
+) -> List[DVConstruct]:
+    """
+    Detect Data Vault constructs for many tables (e.g. a warehouse scan).
+
+    Column roles and table types are memoized, so names repeated across
+    tables (load_date, record_source, hk_*) are classified only once.
+
+    Args:
+        tables: List of tables with 'name' and 'columns' (as for detect_dv_construct)
+        strict: If True, require all mandatory columns
+
+    Returns:
+        DVConstruct per table, in input order
+    """
+    return [
+        detect_dv_construct(table.get("name", ""), table.get("columns", []), strict)
+        for table in tables
+    ]
+
+
+@lru_cache(maxsize=1024)
+def _classify_table(table_lower: str) -> Tuple[DVConstructType, float]:
+    """Detect the construct type and name confidence from a (lower-case) table name."""
+    matches = []
+    if "_" in table_lower:
+        prefix_type = _TABLE_PREFIXES.get(table_lower.partition("_")[0])
+        if prefix_type is not None and _TABLE_TYPE_RANK[prefix_type] == 0:
+            # Nothing outranks the first listed type
+            return prefix_type, 0.8
+        # $ in the patterns also matches just before a trailing newline
+        name_end = table_lower[:-1] if table_lower.endswith("\n") else table_lower
+        suffix_type = _TABLE_SUFFIXES.get(name_end.rpartition("_")[2])
+        matches = [t for t in (prefix_type, suffix_type) if t is not None]
+
+    matches.extend(
+        construct_type for construct_type, regex in _TABLE_REGEXES
+        if regex.search(table_lower)
+    )
+    if not matches:
+        return DVConstructType.UNKNOWN, 0.0
+
+    # Several match: the type listed first in DV_TABLE_PATTERNS wins
+    return min(matches, key=_TABLE_TYPE_RANK.get), 0.8
+
+
 def _detect_column_role(col_name: str) -> str:
     """Detect the role of a column based on naming patterns."""
-    col_lower = col_name.lower()
+    return _ROLE_NAMES[_classify_column(col_name.lower())]
 
-    for role, patterns in DV_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, col_lower):
-                return role
+
+@lru_cache(maxsize=4096)
+def _classify_column(col_lower: str) -> _ColumnRole:
+    """Detect the role of a (lower-case) column name."""
+    # $ in the patterns also matches just before a trailing newline
+    col_end = col_lower[:-1] if col_lower.endswith("\n") else col_lower
+    for role, exact, prefixes, suffixes, regex in _ROLE_RULES:
+        if (col_end in exact
+                or col_lower.startswith(prefixes)
+                or col_end.endswith(suffixes)
+                or (regex is not None and regex.search(col_lower))):
+            return role
 
     # Check for foreign key to hub
-    if re.search(r"^hk_", col_lower):
-        return "fk"
+    if _HUB_FK_PATTERN.search(col_lower):
+        return _ColumnRole.FK
+
+    return _ColumnRole.ATTRIBUTE
 
-    return "attribute"
+
+def _name_tokens(names) -> Set[str]:
+    """
+    Lower-case names plus their forms without the first/last "_" token.
+
+    e.g. "hub_customer" -> {"hub_customer", "customer", "hub"}
+    """
+    tokens = set()
+    for name in names:
+        lower = name.lower()
+        tokens.add(lower)
+        parts = lower.split("_")
+        if len(parts) > 1:
+            tokens.add("_".join(parts[1:]))
+            tokens.add("_".join(parts[:-1]))
+            if len(parts) > 2:
+                tokens.add("_".join(parts[1:-1]))
+    return tokens
 
 
 def validate_dv_model(
@@ -332,19 +545,34 @@ def validate_dv_model(
         "warnings": []
     }
 
-    hubs = {c.name: c for c in constructs if c.construct_type == DVConstructType.HUB}
-    links = {c.name: c for c in constructs if c.construct_type == DVConstructType.LINK}
-    satellites = {c.name: c for c in constructs if c.construct_type == DVConstructType.SATELLITE}
+    # Partition constructs by type in a single pass
+    hubs, links, satellites = {}, {}, {}
+    buckets = {
+        DVConstructType.HUB: hubs,
+        DVConstructType.LINK: links,
+        DVConstructType.SATELLITE: satellites,
+    }
+    for construct in constructs:
+        bucket = buckets.get(construct.construct_type)
+        if bucket is not None:
+            bucket[construct.name] = construct
 
     report["hubs"] = list(hubs.keys())
     report["links"] = list(links.keys())
     report["satellites"] = list(satellites.keys())
 
+    # Name tokens give O(1) hits for the usual exact references; every token
+    # is a substring of its name, so the substring scan is only a fallback
+    hub_tokens = _name_tokens(hubs)
+    link_tokens = _name_tokens(links)
+    hub_lowers = [h.lower() for h in hubs]
+    link_lowers = [l.lower() for l in links]
+
     # Validate Links reference existing Hubs
     for link_name, link in links.items():
         for hub_ref in link.linked_hubs:
             # Try to find matching hub
-            found = any(hub_ref in h.lower() for h in hubs.keys())
+            found = hub_ref in hub_tokens or any(hub_ref in h for h in hub_lowers)
             if not found:
                 report["issues"].append(
                     f"Link '{link_name}' references Hub '{hub_ref}' which was not found"
@@ -354,8 +582,9 @@ def validate_dv_model(
     # Validate Satellites have parent Hub or Link
     for sat_name, sat in satellites.items():
         if sat.parent_hub:
-            found = any(sat.parent_hub in h.lower() for h in hubs.keys())
-            found = found or any(sat.parent_hub in l.lower() for l in links.keys())
+            found = sat.parent_hub in hub_tokens or sat.parent_hub in link_tokens
+            found = found or any(sat.parent_hub in h for h in hub_lowers)
+            found = found or any(sat.parent_hub in l for l in link_lowers)
             if not found:
                 report["warnings"].append(
                     f"Satellite '{sat_name}' parent '{sat.parent_hub}' not found in model"
@@ -367,8 +596,10 @@ def validate_dv_model(
         if sat.parent_hub:
             hubs_with_sats.add(sat.parent_hub)
 
-    for hub_name in hubs.keys():
-        if not any(hub_name.lower() in h for h in hubs_with_sats):
+    for hub_name, hub_lower in zip(hubs, hub_lowers):
+        if hub_lower in hubs_with_sats:
+            continue
+        if not any(hub_lower in h for h in hubs_with_sats):
             report["warnings"].append(
                 f"Hub '{hub_name}' has no associated Satellites"
             )
@@ -398,73 +629,102 @@ def generate_dv_ddl(
     Returns:
         DDL statement
     """
-    lines = [f"-- {construct.construct_type.value.upper()}: {construct.name}"]
+    return "\n".join(_iter_ddl_lines(construct))
+
+
+def generate_dv_ddl_many(
+    constructs: List[DVConstruct],
+    output_file: str
+) -> int:
+    """
+    Write DDL for many Data Vault constructs to a single file.
 
-    if construct.construct_type == DVConstructType.HUB:
-        lines.append(f"CREATE TABLE {construct.name} (")
+    Lines are streamed to the file, so no per-construct DDL strings are built.
+
+    Args:
+        constructs: DVConstructs to generate DDL for
+        output_file: Path of the .sql file to write (UTF-8)
+
+    Returns:
+        Number of constructs written
+    """
+    count = 0
+    with open(output_file, "w", encoding="utf-8") as f:
+        for construct in constructs:
+            if count:
+                f.write("\n")
+            for line in _iter_ddl_lines(construct):
+                f.write(line)
+                f.write("\n")
+            count += 1
+    return count
+
+
+def _iter_ddl_lines(construct: DVConstruct) -> Iterator[str]:
+    """Yield the DDL lines for a Data Vault construct."""
+    construct_type = construct.construct_type
+    name = construct.name
+    hash_key = construct.hash_key
+    hk = hash_key or "hash_key"
+    ld = construct.load_date_column or "load_date"
+    rs = construct.record_source_column or "record_source"
+
+    yield f"-- {construct_type.value.upper()}: {name}"
+
+    if construct_type == DVConstructType.HUB:
+        yield f"CREATE TABLE {name} ("
 
         # Hash key
-        if construct.hash_key:
-            lines.append(f"    {construct.hash_key} BINARY(32) NOT NULL,")
+        if hash_key:
+            yield f"    {hash_key} BINARY(32) NOT NULL,"
 
         # Business keys
         for bk in construct.business_keys:
-            lines.append(f"    {bk} VARCHAR NOT NULL,")
-
-        # Standard columns
-        lines.append(f"    {construct.load_date_column or 'load_date'} TIMESTAMP NOT NULL,")
-        lines.append(f"    {construct.record_source_column or 'record_source'} VARCHAR NOT NULL,")
+            yield f"    {bk} VARCHAR NOT NULL,"
 
-        # Primary key
-        lines.append(f"    PRIMARY KEY ({construct.hash_key or 'hash_key'})")
-        lines.append(");")
+        # Standard columns, primary key
+        yield f"    {ld} TIMESTAMP NOT NULL,"
+        yield f"    {rs} VARCHAR NOT NULL,"
+        yield f"    PRIMARY KEY ({hk})"
+        yield ");"
 
-    elif construct.construct_type == DVConstructType.LINK:
-        lines.append(f"CREATE TABLE {construct.name} (")
+    elif construct_type == DVConstructType.LINK:
+        yield f"CREATE TABLE {name} ("
 
         # Link hash key
-        if construct.hash_key:
-            lines.append(f"    {construct.hash_key} BINARY(32) NOT NULL,")
+        if hash_key:
+            yield f"    {hash_key} BINARY(32) NOT NULL,"
 
         # Hub foreign keys
         for hub in construct.linked_hubs:
-            lines.append(f"    hk_{hub} BINARY(32) NOT NULL,")
-
-        # Standard columns
-        lines.append(f"    {construct.load_date_column or 'load_date'} TIMESTAMP NOT NULL,")
-        lines.append(f"    {construct.record_source_column or 'record_source'} VARCHAR NOT NULL,")
+            yield f"    hk_{hub} BINARY(32) NOT NULL,"
 
-        # Primary key
-        lines.append(f"    PRIMARY KEY ({construct.hash_key or 'hash_key'})")
-        lines.append(");")
+        # Standard columns, primary key
+        yield f"    {ld} TIMESTAMP NOT NULL,"
+        yield f"    {rs} VARCHAR NOT NULL,"
+        yield f"    PRIMARY KEY ({hk})"
+        yield ");"
 
-    elif construct.construct_type == DVConstructType.SATELLITE:
-        lines.append(f"CREATE TABLE {construct.name} (")
+    elif construct_type == DVConstructType.SATELLITE:
+        yield f"CREATE TABLE {name} ("
 
         # Parent hash key
-        if construct.hash_key:
-            lines.append(f"    {construct.hash_key} BINARY(32) NOT NULL,")
+        if hash_key:
+            yield f"    {hash_key} BINARY(32) NOT NULL,"
 
         # Load date (part of PK for satellites)
-        lines.append(f"    {construct.load_date_column or 'load_date'} TIMESTAMP NOT NULL,")
+        yield f"    {ld} TIMESTAMP NOT NULL,"
 
         # Attributes
         for col in construct.columns:
             if col.role == "attribute":
-                lines.append(f"    {col.name} {col.data_type or 'VARCHAR'},")
-
-        # Hash diff
-        lines.append("    hash_diff BINARY(32),")
-
-        # Record source
-        lines.append(f"    {construct.record_source_column or 'record_source'} VARCHAR NOT NULL,")
-
-        # Primary key (hash_key + load_date)
-        pk_cols = f"{construct.hash_key or 'hash_key'}, {construct.load_date_column or 'load_date'}"
-        lines.append(f"    PRIMARY KEY ({pk_cols})")
-        lines.append(");")
+                yield f"    {col.name} {col.data_type or 'VARCHAR'},"
 
-    return "\n".join(lines)
+        # Hash diff, record source, primary key (hash_key + load_date)
+        yield "    hash_diff BINARY(32),"
+        yield f"    {rs} VARCHAR NOT NULL,"
+        yield f"    PRIMARY KEY ({hk}, {ld})"
+        yield ");"
 
 
 def suggest_dv_structure(
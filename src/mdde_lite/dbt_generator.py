@@ -20,13 +20,62 @@ This is a simplified version. The full MDDE framework includes:
 - Test generation from constraints
 """
 
+import functools
+import io
+import json
 import os
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Iterator, Tuple
 from dataclasses import dataclass, field
 import duckdb
 
+try:
+    from yaml import CSafeDumper as _BaseDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _BaseDumper
+
+
+class _Dumper(_BaseDumper):
+    """Safe dumper that writes shared objects in full, without anchors."""
+
+    def ignore_aliases(self, data: Any) -> bool:
+        return True
+
+
+# mapping_type -> handler(source_attribute, transformation) returning the
+# column expression and whether the mapping references its source entity.
+# Unknown types, or a missing expression, select the column unchanged.
+_MAP_HANDLERS = {
+    "direct": lambda source_attr, transform: (source_attr, True),
+    "rename": lambda source_attr, transform: (source_attr, True),
+    "derived": lambda source_attr, transform: (transform, True),
+    "aggregation": lambda source_attr, transform: (transform, True),
+    "constant": lambda source_attr, transform: (transform, False),
+}
+
+
+# Tests for source primary key columns. Shared by every such column; the
+# documents are only serialized, never mutated.
+_PK_TESTS = ["unique", "not_null"]
+
+# A layer's entity rows, and its attribute and mapping rows by entity_id
+_LayerMetadata = Tuple[List[tuple], Dict[str, List[tuple]], Dict[str, List[tuple]]]
+
+# FROM clause for models without a mapped source entity
+_NO_SOURCE_FROM = "-- TODO: Add source reference\nFROM source_table"
+
+# Wide layers fetch their attribute rows in batches to cap peak memory;
+# small layers fetch in one go, where batching only adds a round-trip
+_FETCH_BATCH_ROWS = 2048
+_STREAM_MIN_ENTITIES = 100
+
+# Attribute name from an attribute row (see _get_attributes_by_layer)
+_attr_name = itemgetter(1)
+
 
 @dataclass
 class DbtModel:
@@ -51,7 +100,9 @@ class DbtSource:
 def generate_dbt_project(
     conn: duckdb.DuckDBPyConnection,
     output_dir: str = "generated/dbt",
-    project_name: str = "mdde_demo"
+    project_name: str = "mdde_demo",
+    cache: Optional[Dict[str, _LayerMetadata]] = None,
+    schema_format: str = "yaml"  # "yaml" or "json"
 ) -> Dict[str, Any]:
     """
     Generate a complete dbt project from MDDE metadata.
@@ -60,10 +111,21 @@ def generate_dbt_project(
         conn: DuckDB connection with MDDE metadata
         output_dir: Output directory for dbt project
         project_name: Name of the dbt project
+        cache: Optional dict owned by the caller, mapping layer name to the
+            metadata loaded for it. Layers missing from it are loaded and
+            added; later calls passing the same dict skip those queries.
+            Clear it after changing the metadata or switching connection.
+        schema_format: "yaml" for block-style sources.yml/schema.yml, or
+            "json" to write them as compact JSON (valid YAML, read by dbt
+            as-is) for projects whose properties files are never edited
 
     Returns:
         Dictionary with generation statistics
     """
+    dump = _SCHEMA_DUMPERS.get(schema_format)
+    if dump is None:
+        raise ValueError(f"Unsupported schema format: {schema_format}")
+
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
@@ -75,10 +137,8 @@ def generate_dbt_project(
     }
 
     # Generate dbt_project.yml
-    project_yml = _generate_project_yml(project_name)
     project_file = output_path / "dbt_project.yml"
-    with open(project_file, "w") as f:
-        yaml.dump(project_yml, f, default_flow_style=False, sort_keys=False)
+    project_file.write_bytes(_project_yml_bytes(project_name))
     stats["files"].append(str(project_file))
 
     # Create directory structure
@@ -89,40 +149,131 @@ def generate_dbt_project(
     sources = _generate_sources(conn)
     if sources:
         sources_file = models_dir / "sources.yml"
-        with open(sources_file, "w") as f:
-            yaml.dump({"version": 2, "sources": sources}, f,
-                     default_flow_style=False, sort_keys=False)
+        sources_file.write_bytes(dump({"version": 2, "sources": sources}))
         stats["sources_generated"] = len(sources)
         stats["files"].append(str(sources_file))
 
-    # Generate models by layer
+    # Generate models by layer. Layers are independent, so each runs on a
+    # worker thread with its own cursor; results are merged in layer order
+    # to keep the file list deterministic.
     layers = ["staging", "integration", "business"]
-    for layer in layers:
-        layer_dir = models_dir / layer
-        entities = _get_entities_by_layer(conn, layer)
-
-        if entities:
-            layer_dir.mkdir(exist_ok=True)
-
-            # Generate SQL models
-            for entity in entities:
-                model = _generate_model(conn, entity)
-                if model:
-                    # Write SQL file
-                    sql_file = layer_dir / f"{model.name}.sql"
-                    with open(sql_file, "w") as f:
-                        f.write(model.sql)
-                    stats["models_generated"] += 1
-                    stats["files"].append(str(sql_file))
-
-            # Generate schema.yml for layer
-            schema = _generate_schema_yml(conn, layer)
-            if schema.get("models"):
-                schema_file = layer_dir / "schema.yml"
-                with open(schema_file, "w") as f:
-                    yaml.dump(schema, f, default_flow_style=False, sort_keys=False)
-                stats["schema_files"] += 1
-                stats["files"].append(str(schema_file))
+    if cache is not None:
+        # Layers missing from the cache are loaded here, on the caller's
+        # connection; the workers only generate and write files
+        for layer in layers:
+            if layer not in cache:
+                cache[layer] = _load_layer(conn, layer)
+        metadata = [cache[layer] for layer in layers]
+        with ThreadPoolExecutor(max_workers=len(layers)) as executor:
+            layer_stats = list(executor.map(
+                _write_layer, layers, metadata, repeat(models_dir), repeat(dump)
+            ))
+    else:
+        cursors = [conn.cursor() for _ in layers]
+        try:
+            with ThreadPoolExecutor(max_workers=len(layers)) as executor:
+                layer_stats = list(executor.map(
+                    _generate_layer, cursors, layers, repeat(models_dir),
+                    repeat(dump)
+                ))
+        finally:
+            for cursor in cursors:
+                cursor.close()
+
+    for partial in layer_stats:
+        stats["models_generated"] += partial["models_generated"]
+        stats["schema_files"] += partial["schema_files"]
+        stats["files"].extend(partial["files"])
+
+    return stats
+
+
+def _generate_layer(
+    conn: duckdb.DuckDBPyConnection,
+    layer: str,
+    models_dir: Path,
+    dump: Callable[[Dict[str, Any]], bytes]
+) -> Dict[str, Any]:
+    """
+    Generate the SQL models and schema.yml for one layer.
+
+    Args:
+        conn: DuckDB connection (or cursor) owned by the calling thread
+        layer: Layer name, also used as the models subdirectory
+        models_dir: The project's models directory
+        dump: schema.yml serializer, from _SCHEMA_DUMPERS
+
+    Returns:
+        Partial statistics: models_generated, schema_files and files
+    """
+    return _write_layer(layer, _load_layer(conn, layer), models_dir, dump)
+
+
+def _load_layer(
+    conn: duckdb.DuckDBPyConnection,
+    layer: str
+) -> _LayerMetadata:
+    """
+    Fetch a layer's entities, plus its attributes and mappings grouped by
+    entity_id, with one query each.
+    """
+    entities = _get_entities_by_layer(conn, layer)
+    if not entities:
+        return entities, {}, {}
+
+    attrs_by_entity = _get_attributes_by_layer(
+        conn, layer, stream=len(entities) >= _STREAM_MIN_ENTITIES
+    )
+    mappings_by_entity = _get_mappings_by_layer(conn, layer)
+    return entities, attrs_by_entity, mappings_by_entity
+
+
+def _write_layer(
+    layer: str,
+    metadata: _LayerMetadata,
+    models_dir: Path,
+    dump: Callable[[Dict[str, Any]], bytes]
+) -> Dict[str, Any]:
+    """Write a layer's SQL models and schema.yml from its loaded metadata."""
+    stats = {
+        "models_generated": 0,
+        "schema_files": 0,
+        "files": []
+    }
+
+    entities, attrs_by_entity, mappings_by_entity = metadata
+    if not entities:
+        return stats
+
+    layer_dir = models_dir / layer
+    layer_dir.mkdir(exist_ok=True)
+    # Joining strings avoids building a PurePath per model file
+    layer_dir_str = os.fspath(layer_dir)
+
+    # Generate SQL models
+    for entity in entities:
+        entity_id = entity[0]
+        model = _generate_model(
+            entity,
+            attrs_by_entity.get(entity_id, []),
+            mappings_by_entity.get(entity_id, [])
+        )
+        if model:
+            # Write SQL file
+            sql_file = os.path.join(layer_dir_str, model.name + ".sql")
+            # Same as Path.write_bytes, without converting back to a Path
+            with open(sql_file, "wb") as f:
+                f.write(model.sql.encode("utf-8"))
+            stats["models_generated"] += 1
+            stats["files"].append(sql_file)
+
+    # Generate schema.yml for layer
+    schema = _generate_schema_yml(entities, attrs_by_entity)
+    if schema.get("models"):
+        schema_file = layer_dir / "schema.yml"
+        schema_file.write_bytes(dump(schema))
+        stats["schema_files"] += 1
+        stats["files"].append(str(schema_file))
 
     return stats
 
@@ -160,6 +311,14 @@ def _generate_project_yml(project_name: str) -> Dict[str, Any]:
     }
 
 
+@functools.lru_cache(maxsize=16)
+def _project_yml_bytes(project_name: str) -> bytes:
+    """Serialized dbt_project.yml; the content depends only on the name."""
+    return yaml.dump(_generate_project_yml(project_name), Dumper=_Dumper,
+                     default_flow_style=False, sort_keys=False,
+                     encoding="utf-8")
+
+
 def _generate_sources(conn: duckdb.DuckDBPyConnection) -> List[Dict[str, Any]]:
     """Generate sources.yml from source entities."""
     sources = []
@@ -175,16 +334,21 @@ def _generate_sources(conn: duckdb.DuckDBPyConnection) -> List[Dict[str, Any]]:
     if not source_entities:
         return sources
 
+    # Fetch all source columns in one query instead of one per entity
+    columns_by_entity: Dict[str, List[tuple]] = {}
+    for row in conn.execute("""
+        SELECT a.entity_id, a.name, a.description, a.is_primary_key
+        FROM attribute a
+        JOIN entity e ON a.entity_id = e.entity_id
+        WHERE e.layer = 'source' OR e.stereotype LIKE 'src_%'
+        ORDER BY a.entity_id, a.ordinal_position
+    """).fetchall():
+        columns_by_entity.setdefault(row[0], []).append(row[1:])
+
     # Group by source system (simple grouping by prefix)
     source_tables = []
     for entity_id, name, description in source_entities:
-        # Get attributes for this entity
-        columns = conn.execute("""
-            SELECT name, data_type, description, is_primary_key
-            FROM attribute
-            WHERE entity_id = ?
-            ORDER BY ordinal_position
-        """, [entity_id]).fetchall()
+        columns = columns_by_entity.get(entity_id)
 
         table_entry = {
             "name": name,
@@ -192,14 +356,16 @@ def _generate_sources(conn: duckdb.DuckDBPyConnection) -> List[Dict[str, Any]]:
         }
 
         if columns:
-            table_entry["columns"] = [
-                {
+            source_columns = []
+            for col_name, col_desc, is_pk in columns:
+                col = {
                     "name": col_name,
-                    "description": col_desc or f"Column {col_name}",
-                    **({"tests": ["unique", "not_null"]} if is_pk else {})
+                    "description": col_desc or f"Column {col_name}"
                 }
-                for col_name, col_type, col_desc, is_pk in columns
-            ]
+                if is_pk:
+                    col["tests"] = _PK_TESTS
+                source_columns.append(col)
+            table_entry["columns"] = source_columns
 
         source_tables.append(table_entry)
 
@@ -226,16 +392,63 @@ def _get_entities_by_layer(
     """, [layer]).fetchall()
 
 
-def _generate_model(
+def _get_attributes_by_layer(
     conn: duckdb.DuckDBPyConnection,
-    entity: tuple
-) -> Optional[DbtModel]:
-    """Generate a dbt model from entity metadata."""
-    entity_id, name, description, stereotype = entity
+    layer: str,
+    stream: bool = False
+) -> Dict[str, List[tuple]]:
+    """
+    Get the attributes of every entity in a layer, grouped by entity_id.
+
+    Each attribute is a tuple of (attribute_id, name, is_derived, expression,
+    is_primary_key, is_nullable, description), in ordinal order. Only the
+    columns the generator uses are selected, since every fetched value is
+    boxed into a Python object.
+
+    Args:
+        conn: DuckDB connection with MDDE metadata
+        layer: Layer name
+        stream: Fetch rows in batches of _FETCH_BATCH_ROWS rather than all
+            at once, so the raw result list is never held in full
+    """
+    result = conn.execute("""
+        SELECT entity_id, attribute_id, name, is_derived, expression,
+               is_primary_key, is_nullable, description
+        FROM attribute
+        WHERE entity_id IN (SELECT entity_id FROM entity WHERE layer = ?)
+        ORDER BY entity_id, ordinal_position
+    """, [layer])
+    rows = _iter_batched(result) if stream else result.fetchall()
+
+    attrs_by_entity: Dict[str, List[tuple]] = {}
+    for row in rows:
+        attrs_by_entity.setdefault(row[0], []).append(row[1:])
+    return attrs_by_entity
+
+
+def _iter_batched(result: duckdb.DuckDBPyConnection) -> Iterator[tuple]:
+    """Yield the rows of a pending result, fetching them in batches."""
+    while True:
+        batch = result.fetchmany(_FETCH_BATCH_ROWS)
+        if not batch:
+            return
+        yield from batch
 
-    # Get attribute mappings (lineage) for this entity
-    mappings = conn.execute("""
+
+def _get_mappings_by_layer(
+    conn: duckdb.DuckDBPyConnection,
+    layer: str
+) -> Dict[str, List[tuple]]:
+    """
+    Get the attribute mappings (lineage) targeting a layer, grouped by
+    target entity_id.
+
+    Each mapping is a tuple of (target_attribute_id, source_entity_id,
+    source_attribute_id, mapping_type, transformation, source_entity_name).
+    """
+    rows = conn.execute("""
         SELECT
+            am.target_entity_id,
             am.target_attribute_id,
             am.source_entity_id,
             am.source_attribute_id,
@@ -244,79 +457,85 @@ def _generate_model(
             se.name as source_entity_name
         FROM attribute_mapping am
         LEFT JOIN entity se ON am.source_entity_id = se.entity_id
-        WHERE am.target_entity_id = ?
-        ORDER BY am.target_attribute_id
-    """, [entity_id]).fetchall()
+        WHERE am.target_entity_id IN (SELECT entity_id FROM entity WHERE layer = ?)
+        ORDER BY am.target_entity_id, am.target_attribute_id
+    """, [layer]).fetchall()
 
-    # Get all attributes for this entity
-    attributes = conn.execute("""
-        SELECT attribute_id, name, data_type, is_derived, expression
-        FROM attribute
-        WHERE entity_id = ?
-        ORDER BY ordinal_position
-    """, [entity_id]).fetchall()
+    mappings_by_entity: Dict[str, List[tuple]] = {}
+    for row in rows:
+        mappings_by_entity.setdefault(row[0], []).append(row[1:])
+    return mappings_by_entity
+
+
+def _generate_model(
+    entity: tuple,
+    attributes: List[tuple],
+    mappings: List[tuple]
+) -> Optional[DbtModel]:
+    """
+    Generate a dbt model from entity metadata.
+
+    Args:
+        entity: (entity_id, name, description, stereotype) row
+        attributes: The entity's attributes, as from _get_attributes_by_layer
+        mappings: Mappings targeting the entity, as from _get_mappings_by_layer
+    """
+    entity_id, name, description, stereotype = entity
 
     if not attributes:
         return None
 
-    # Build SELECT clause
-    select_parts = []
-    source_refs = set()
+    # Build SELECT clause; each column is written with a trailing ",\n"
+    select_buf = io.StringIO()
+    write = select_buf.write
+    # First referenced source entity, in attribute order
+    primary_source = None
 
-    for attr_id, attr_name, data_type, is_derived, expression in attributes:
+    # Index mappings by target attribute; reversed so the first mapping
+    # for an attribute wins, as with a linear search
+    mapping_by_attr = {m[0]: m for m in reversed(mappings)}
+
+    for attr_id, attr_name, is_derived, expression, *_ in attributes:
         # Find mapping for this attribute
-        mapping = next(
-            (m for m in mappings if m[0] == attr_id),
-            None
-        )
+        mapping = mapping_by_attr.get(attr_id)
 
         if mapping:
             target_attr, source_ent_id, source_attr, map_type, transform, source_name = mapping
 
-            if map_type == "direct" and source_attr:
-                select_parts.append(f"    {source_attr} AS {attr_name}")
-                if source_name:
-                    source_refs.add(source_name)
-            elif map_type == "rename" and source_attr:
-                select_parts.append(f"    {source_attr} AS {attr_name}")
-                if source_name:
-                    source_refs.add(source_name)
-            elif map_type == "derived" and transform:
-                select_parts.append(f"    {transform} AS {attr_name}")
-                if source_name:
-                    source_refs.add(source_name)
-            elif map_type == "aggregation" and transform:
-                select_parts.append(f"    {transform} AS {attr_name}")
-                if source_name:
-                    source_refs.add(source_name)
-            elif map_type == "constant" and transform:
-                select_parts.append(f"    {transform} AS {attr_name}")
+            handler = _MAP_HANDLERS.get(map_type)
+            expr, uses_source = (
+                handler(source_attr, transform) if handler else (None, False)
+            )
+
+            if expr:
+                write(f"    {expr} AS {attr_name},\n")
+                if uses_source and primary_source is None and source_name:
+                    primary_source = source_name
             else:
-                select_parts.append(f"    {attr_name}")
+                write(f"    {attr_name},\n")
         elif is_derived and expression:
-            select_parts.append(f"    {expression} AS {attr_name}")
+            write(f"    {expression} AS {attr_name},\n")
         else:
-            select_parts.append(f"    {attr_name}")
+            write(f"    {attr_name},\n")
+
+    select_clause = select_buf.getvalue()[:-2]
 
     # Build FROM clause with refs
-    if source_refs:
-        primary_source = list(source_refs)[0]
+    if primary_source:
         from_clause = f"FROM {{{{ ref('{primary_source}') }}}}"
     else:
-        from_clause = f"-- TODO: Add source reference\nFROM source_table"
+        from_clause = _NO_SOURCE_FROM
 
     # Generate SQL
-    sql_parts = [
-        f"-- Model: {name}",
-        f"-- Description: {description or 'Generated from MDDE metadata'}",
-        f"-- Stereotype: {stereotype or 'none'}",
-        "",
-        "SELECT",
-        ",\n".join(select_parts),
-        from_clause
-    ]
-
-    sql = "\n".join(sql_parts)
+    sql = (
+        f"-- Model: {name}\n"
+        f"-- Description: {description or 'Generated from MDDE metadata'}\n"
+        f"-- Stereotype: {stereotype or 'none'}\n"
+        "\n"
+        "SELECT\n"
+        f"{select_clause}\n"
+        f"{from_clause}"
+    )
 
     # Build schema.yml entry
     schema_yml = {
@@ -324,7 +543,7 @@ def _generate_model(
         "description": description or f"Model {name}",
         "columns": [
             {"name": attr_name, "description": f"Column {attr_name}"}
-            for _, attr_name, _, _, _ in attributes
+            for attr_name in map(_attr_name, attributes)
         ]
     }
 
@@ -338,24 +557,17 @@ def _generate_model(
 
 
 def _generate_schema_yml(
-    conn: duckdb.DuckDBPyConnection,
-    layer: str
+    entities: List[tuple],
+    attrs_by_entity: Dict[str, List[tuple]]
 ) -> Dict[str, Any]:
-    """Generate schema.yml for a layer."""
+    """Generate schema.yml for a layer's entities."""
     schema = {
         "version": 2,
         "models": []
     }
 
-    entities = _get_entities_by_layer(conn, layer)
-
     for entity_id, name, description, stereotype in entities:
-        attributes = conn.execute("""
-            SELECT name, description, is_primary_key, is_nullable
-            FROM attribute
-            WHERE entity_id = ?
-            ORDER BY ordinal_position
-        """, [entity_id]).fetchall()
+        attributes = attrs_by_entity.get(entity_id)
 
         model_entry = {
             "name": name,
@@ -364,7 +576,7 @@ def _generate_schema_yml(
 
         if attributes:
             columns = []
-            for attr_name, attr_desc, is_pk, is_nullable in attributes:
+            for _, attr_name, _, _, is_pk, is_nullable, attr_desc in attributes:
                 col = {
                     "name": attr_name,
                     "description": attr_desc or f"Column {attr_name}"
@@ -389,6 +601,31 @@ def _generate_schema_yml(
     return schema
 
 
+def _dump_schema_yml(data: Dict[str, Any]) -> bytes:
+    """Serialize a schema.yml / sources.yml document to UTF-8 bytes."""
+    return yaml.dump(data, Dumper=_Dumper,
+                     default_flow_style=False, sort_keys=False,
+                     encoding="utf-8")
+
+
+def _dump_schema_json(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize a schema.yml / sources.yml document as compact JSON.
+
+    JSON is a subset of YAML, so dbt reads the file unchanged, and the
+    stdlib's C encoder is several times faster than any YAML emitter.
+    Non-ASCII text is written as \\u escapes, which YAML also accepts.
+    """
+    return json.dumps(data).encode("ascii") + b"\n"
+
+
+# schema_format -> properties file serializer
+_SCHEMA_DUMPERS = {
+    "yaml": _dump_schema_yml,
+    "json": _dump_schema_json,
+}
+
+
 def generate_model_sql(
     entity_name: str,
     columns: List[str],
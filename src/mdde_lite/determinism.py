@@ -43,13 +43,17 @@ This is a simplified version. The full MDDE framework includes:
 """
 
 import sqlglot
+from collections import deque
 from sqlglot import exp
 from typing import List, Dict, Optional, Set, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache
 import re
 
+from ._parallel import map_in_processes
 
-@dataclass
+
+@dataclass(slots=True)
 class DeterminismIssue:
     """Represents a determinism problem in SQL."""
     issue_type: str
@@ -74,6 +78,36 @@ VOLATILE_FUNCTIONS = {
     "CURRENT_DATE", "CURRENT_TIME",
 }
 
+# Issue type for each ordered window function used without ORDER BY
+_NO_ORDER_ISSUE_TYPE = {
+    "ROW_NUMBER": "WINDOW_NO_ORDER",
+    "RANK": "WINDOW_NO_ORDER",
+    "DENSE_RANK": "WINDOW_NO_ORDER",
+    "NTILE": "WINDOW_NO_ORDER",
+    "FIRST_VALUE": "FIRST_LAST_NO_ORDER",
+    "LAST_VALUE": "FIRST_LAST_NO_ORDER",
+    "LAG": "LAG_LEAD_NO_ORDER",
+    "LEAD": "LAG_LEAD_NO_ORDER",
+    "NTH_VALUE": "LAG_LEAD_NO_ORDER",
+}
+
+# (severity, behaviour) reported for each volatile function
+_VOLATILE_SEVERITY = {
+    **dict.fromkeys(
+        ("RANDOM", "RAND"),
+        ("error", "produces different values each execution"),
+    ),
+    **dict.fromkeys(
+        ("UUID", "GEN_RANDOM_UUID", "NEWID", "UUID_GENERATE_V4"),
+        ("warning", "generates new UUIDs each execution"),
+    ),
+    **dict.fromkeys(
+        ("NOW", "CURRENT_TIMESTAMP", "SYSDATE", "GETDATE", "SYSTIMESTAMP",
+         "CURRENT_DATE", "CURRENT_TIME"),
+        ("info", "returns current time - varies between runs"),
+    ),
+}
+
 # Common tie-breaker column patterns (in priority order)
 TIE_BREAKER_PATTERNS = [
     r".*_source_row_id$",
@@ -91,6 +125,41 @@ TIE_BREAKER_PATTERNS = [
     r".*_id$",
 ]
 
+# All tie-breaker patterns as one alternation: re tries the branches in
+# order, so the group that fires is the highest-priority pattern matching
+_FUSED_TIE_BREAKERS = re.compile(
+    "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(TIE_BREAKER_PATTERNS)),
+    re.IGNORECASE,
+)
+
+# Resolved names per expression class; sql_name() and key are class-level in
+# sqlglot, so they never depend on the instance and are looked up once
+_FUNCTION_NAMES: Dict[type, str] = {}
+
+# Typed function classes resolved to their volatile name (None if not
+# volatile); seeded with the ones sqlglot parses volatile calls into and
+# filled in for other classes on first sight
+_VOLATILE_CLASSES: Dict[type, Optional[str]] = {
+    cls: cls.sql_name().upper()
+    for cls in (
+        exp.Rand, exp.Uuid, exp.CurrentDate, exp.CurrentTime,
+        exp.CurrentTimestamp, exp.Systimestamp,
+    )
+}
+
+# Subtrees the determinism walk does not descend into
+_LEAF_EXPRESSIONS = (exp.Literal, exp.Column)
+
+# Upper-case substrings of everything the checks can flag: OVER for window
+# functions, LIMIT/TOP/FETCH for row limits, and every spelling sqlglot
+# parses into a volatile function (RANDOM, GEN_RANDOM_UUID, CURDATE,
+# CURRENT_TIMESTAMP, SYSDATETIME, LOCALTIMESTAMP, ...). SQL containing none
+# of them cannot produce an issue, so its parse tree is not walked.
+_TRIGGER_KEYWORDS = (
+    "OVER", "LIMIT", "TOP", "FETCH",
+    "RAND", "UUID", "NEWID", "NOW", "CUR", "SYS", "GETDATE", "LOCALTIME", "TODAY",
+)
+
 
 def check_determinism(sql_content: str) -> List[DeterminismIssue]:
     """
@@ -107,11 +176,41 @@ def check_determinism(sql_content: str) -> List[DeterminismIssue]:
         >>> issues = check_determinism(sql)
         >>> print(issues[0].issue_type)
         WINDOW_NO_ORDER
+
+    Results are cached per SQL string, so re-checking unchanged SQL (batch
+    linting, watch mode) skips parsing entirely.
+    """
+    # The cached issues are shared, so every caller gets its own copies
+    return [
+        replace(issue, tie_breaker_columns=list(issue.tie_breaker_columns))
+        for issue in _check_determinism_cached(sql_content)
+    ]
+
+
+def check_determinism_batch(
+    sqls: List[str],
+    workers: Optional[int] = None
+) -> List[List[DeterminismIssue]]:
     """
+    Check many independent SQL queries for determinism issues in parallel.
+
+    Args:
+        sqls: SQL queries to check (e.g. one per file)
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        List of DeterminismIssue objects per query, in input order
+    """
+    return map_in_processes(check_determinism, sqls, workers)
+
+
+@lru_cache(maxsize=4096)
+def _check_determinism_cached(sql_content: str) -> Tuple[DeterminismIssue, ...]:
+    """Analyze SQL for non-deterministic patterns; see check_determinism."""
     try:
         parsed = sqlglot.parse_one(sql_content)
     except Exception as e:
-        return [DeterminismIssue(
+        return (DeterminismIssue(
             issue_type="PARSE_ERROR",
             severity="error",
             message=str(e),
@@ -119,208 +218,213 @@ def check_determinism(sql_content: str) -> List[DeterminismIssue]:
             suggestion="Fix syntax error",
             tie_breaker_columns=[],
             dq_check_sql=None,
-        )]
-
-    issues = []
-
-    # Check window functions
-    issues.extend(_check_window_functions(parsed))
-
-    # Check LIMIT/TOP without ORDER BY
-    issues.extend(_check_limit_without_order(parsed))
-
-    # Check volatile functions
-    issues.extend(_check_volatile_functions(parsed))
-
-    # Check DISTINCT without ORDER BY context
-    issues.extend(_check_distinct_determinism(parsed))
-
-    return issues
-
-
-def _check_window_functions(parsed: exp.Expression) -> List[DeterminismIssue]:
-    """Check window functions for determinism issues."""
-    issues = []
-
-    for window in parsed.find_all(exp.Window):
-        func = window.this
-        func_name = _get_function_name(func)
-
-        if func_name not in ALL_ORDERED_WINDOW_FUNCTIONS:
+        ),)
+
+    upper = sql_content.upper()
+    if not any(keyword in upper for keyword in _TRIGGER_KEYWORDS):
+        return ()
+
+    return _check_parsed(parsed)
+
+
+def _check_parsed(parsed: exp.Expression) -> Tuple[DeterminismIssue, ...]:
+    """Run every determinism check over an already parsed statement."""
+    # One walk feeds every check; each keeps its own list so issues come
+    # out grouped window -> limit -> volatile -> distinct as before.
+    window_issues: List[DeterminismIssue] = []
+    limit_issues: List[DeterminismIssue] = []
+    volatile_issues: List[DeterminismIssue] = []
+    distinct_issues: List[DeterminismIssue] = []
+    seen_functions: Set[str] = set()
+
+    # Breadth-first like walk(), without descending into literals and
+    # columns, which never hold windows, SELECTs or function calls
+    queue = deque((parsed,))
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, _LEAF_EXPRESSIONS):
             continue
+        queue.extend(node.iter_expressions())
 
-        # Check for ORDER BY in window spec
-        order_by = window.args.get("order")
+        if isinstance(node, exp.Window):
+            _check_window_function(node, window_issues)
+        elif isinstance(node, exp.Select):
+            _check_select(node, limit_issues, distinct_issues)
+        elif isinstance(node, exp.Func):
+            _check_volatile_function(node, seen_functions, volatile_issues)
 
-        if not order_by:
-            # No ORDER BY at all - definitely non-deterministic
-            issue_type = "WINDOW_NO_ORDER"
-            if func_name in NAVIGATION_FUNCTIONS:
-                issue_type = "FIRST_LAST_NO_ORDER" if func_name in {"FIRST_VALUE", "LAST_VALUE"} else "LAG_LEAD_NO_ORDER"
+    return tuple(window_issues + limit_issues + volatile_issues + distinct_issues)
 
-            issues.append(DeterminismIssue(
-                issue_type=issue_type,
-                severity="error",
-                message=f"{func_name}() without ORDER BY - results are non-deterministic",
-                location=f"{func_name} window function",
-                suggestion=f"Add ORDER BY clause with unique columns to {func_name}()",
-                tie_breaker_columns=["primary_key", "created_at", "row_id"],
-                dq_check_sql=_generate_dq_check(func_name, window),
-            ))
-        else:
-            # Has ORDER BY - but is it unique enough?
-            order_cols = _extract_order_columns(order_by)
-
-            if func_name in RANKING_FUNCTIONS:
-                # For ROW_NUMBER etc., ORDER BY should be unique within partition
-                partition_cols = _extract_partition_columns(window)
-
-                issues.append(DeterminismIssue(
-                    issue_type="WINDOW_NON_UNIQUE_ORDER",
-                    severity="warning",
-                    message=f"{func_name}() ORDER BY ({', '.join(order_cols)}) may not be unique within partition",
-                    location=f"{func_name} window function",
-                    suggestion=f"Ensure ORDER BY includes a unique column (PK or tie-breaker)",
-                    tie_breaker_columns=["primary_key", "_source_row_id", "created_at"],
-                    dq_check_sql=_generate_uniqueness_check(func_name, partition_cols, order_cols),
-                ))
-
-    return issues
-
-
-def _check_limit_without_order(parsed: exp.Expression) -> List[DeterminismIssue]:
-    """Check for LIMIT/TOP without ORDER BY."""
-    issues = []
-
-    for select in parsed.find_all(exp.Select):
-        # Check for LIMIT
-        limit = select.args.get("limit")
-        if not limit:
-            continue
-
-        # Check for ORDER BY
-        order = select.args.get("order")
-        if not order:
-            issues.append(DeterminismIssue(
-                issue_type="LIMIT_NO_ORDER",
-                severity="error",
-                message="LIMIT/TOP without ORDER BY - returns arbitrary rows",
-                location="SELECT with LIMIT",
-                suggestion="Add ORDER BY clause to ensure consistent row selection",
-                tie_breaker_columns=["primary_key", "created_at"],
-                dq_check_sql=None,  # Can't easily generate DQ check for this
-            ))
-
-    return issues
 
+def _check_window_function(window: exp.Window, issues: List[DeterminismIssue]) -> None:
+    """Check a window function for determinism issues."""
+    func = window.this
+    func_name = _get_function_name(func)
 
-def _check_volatile_functions(parsed: exp.Expression) -> List[DeterminismIssue]:
-    """Check for volatile/non-deterministic functions."""
-    issues = []
-    seen_functions = set()
+    if func_name not in ALL_ORDERED_WINDOW_FUNCTIONS:
+        return
 
-    for func in parsed.find_all(exp.Func):
-        func_name = _get_function_name(func)
+    # Check for ORDER BY in window spec
+    order_by = window.args.get("order")
 
-        # Handle Anonymous functions (like NOW() in some dialects)
-        if isinstance(func, exp.Anonymous):
-            func_name = func.name.upper() if func.name else "ANONYMOUS"
-
-        if func_name in VOLATILE_FUNCTIONS and func_name not in seen_functions:
-            seen_functions.add(func_name)
-
-            if func_name in {"RANDOM", "RAND"}:
-                severity = "error"
-                message = f"{func_name}() produces different values each execution"
-            elif func_name in {"UUID", "GEN_RANDOM_UUID", "NEWID", "UUID_GENERATE_V4"}:
-                severity = "warning"
-                message = f"{func_name}() generates new UUIDs each execution"
-            else:
-                severity = "info"
-                message = f"{func_name}() returns current time - varies between runs"
+    if not order_by:
+        # No ORDER BY at all - definitely non-deterministic
+        issues.append(DeterminismIssue(
+            issue_type=_NO_ORDER_ISSUE_TYPE[func_name],
+            severity="error",
+            message=f"{func_name}() without ORDER BY - results are non-deterministic",
+            location=f"{func_name} window function",
+            suggestion=f"Add ORDER BY clause with unique columns to {func_name}()",
+            tie_breaker_columns=["primary_key", "created_at", "row_id"],
+            dq_check_sql=_generate_dq_check(func_name, window),
+        ))
+    else:
+        # Has ORDER BY - but is it unique enough?
+        order_cols = _extract_order_columns(order_by)
+
+        if func_name in RANKING_FUNCTIONS:
+            # For ROW_NUMBER etc., ORDER BY should be unique within partition
+            partition_cols = _extract_partition_columns(window)
 
             issues.append(DeterminismIssue(
-                issue_type="VOLATILE_FUNCTION",
-                severity=severity,
-                message=message,
-                location=f"{func_name}() function call",
-                suggestion="For regression testing, consider parameterizing time-dependent values",
-                tie_breaker_columns=[],
-                dq_check_sql=None,
+                issue_type="WINDOW_NON_UNIQUE_ORDER",
+                severity="warning",
+                message=f"{func_name}() ORDER BY ({', '.join(order_cols)}) may not be unique within partition",
+                location=f"{func_name} window function",
+                suggestion=f"Ensure ORDER BY includes a unique column (PK or tie-breaker)",
+                tie_breaker_columns=["primary_key", "_source_row_id", "created_at"],
+                dq_check_sql=_generate_uniqueness_check(func_name, partition_cols, order_cols),
             ))
 
-    return issues
-
-
-def _check_distinct_determinism(parsed: exp.Expression) -> List[DeterminismIssue]:
-    """Check DISTINCT for potential ordering issues."""
-    issues = []
-
-    for select in parsed.find_all(exp.Select):
-        if not select.args.get("distinct"):
-            continue
 
-        # DISTINCT with LIMIT but no ORDER BY is problematic
-        limit = select.args.get("limit")
-        order = select.args.get("order")
+def _check_select(
+    select: exp.Select,
+    limit_issues: List[DeterminismIssue],
+    distinct_issues: List[DeterminismIssue],
+) -> None:
+    """Check a SELECT for LIMIT/TOP and DISTINCT without ORDER BY."""
+    limit = select.args.get("limit")
+    if not limit:
+        return
+
+    # Check for ORDER BY
+    if select.args.get("order"):
+        return
+
+    limit_issues.append(DeterminismIssue(
+        issue_type="LIMIT_NO_ORDER",
+        severity="error",
+        message="LIMIT/TOP without ORDER BY - returns arbitrary rows",
+        location="SELECT with LIMIT",
+        suggestion="Add ORDER BY clause to ensure consistent row selection",
+        tie_breaker_columns=["primary_key", "created_at"],
+        dq_check_sql=None,  # Can't easily generate DQ check for this
+    ))
+
+    # DISTINCT with LIMIT but no ORDER BY is problematic
+    if select.args.get("distinct"):
+        distinct_issues.append(DeterminismIssue(
+            issue_type="DISTINCT_NO_ORDER",
+            severity="warning",
+            message="SELECT DISTINCT with LIMIT but no ORDER BY - arbitrary row selection",
+            location="SELECT DISTINCT with LIMIT",
+            suggestion="Add ORDER BY to ensure consistent row selection",
+            tie_breaker_columns=[],
+            dq_check_sql=None,
+        ))
 
-        if limit and not order:
-            issues.append(DeterminismIssue(
-                issue_type="DISTINCT_NO_ORDER",
-                severity="warning",
-                message="SELECT DISTINCT with LIMIT but no ORDER BY - arbitrary row selection",
-                location="SELECT DISTINCT with LIMIT",
-                suggestion="Add ORDER BY to ensure consistent row selection",
-                tie_breaker_columns=[],
-                dq_check_sql=None,
-            ))
 
-    return issues
+def _volatile_class_name(func: exp.Func) -> Optional[str]:
+    """Volatile function name for a typed sqlglot function call, else None."""
+    try:
+        return _VOLATILE_CLASSES[type(func)]
+    except KeyError:
+        pass
+    name = _get_function_name(func)
+    volatile_name = name if name in VOLATILE_FUNCTIONS else None
+    _VOLATILE_CLASSES[type(func)] = volatile_name
+    return volatile_name
+
+
+def _check_volatile_function(
+    func: exp.Func,
+    seen_functions: Set[str],
+    issues: List[DeterminismIssue],
+) -> None:
+    """Check a function call for volatile/non-deterministic behaviour."""
+    # Handle Anonymous functions (like NOW() in some dialects)
+    if isinstance(func, exp.Anonymous):
+        func_name = func.name.upper() if func.name else "ANONYMOUS"
+        if func_name not in VOLATILE_FUNCTIONS:
+            return
+    else:
+        func_name = _volatile_class_name(func)
+        if func_name is None:
+            return
+
+    if func_name in seen_functions:
+        return
+    seen_functions.add(func_name)
+
+    severity, behaviour = _VOLATILE_SEVERITY[func_name]
+
+    issues.append(DeterminismIssue(
+        issue_type="VOLATILE_FUNCTION",
+        severity=severity,
+        message=f"{func_name}() {behaviour}",
+        location=f"{func_name}() function call",
+        suggestion="For regression testing, consider parameterizing time-dependent values",
+        tie_breaker_columns=[],
+        dq_check_sql=None,
+    ))
 
 
 def _get_function_name(func: exp.Expression) -> str:
     """Extract function name from expression."""
+    name = _FUNCTION_NAMES.get(type(func))
+    if name is not None:
+        return name
+
+    cls = type(func)
     # Try sql_name first (most reliable for sqlglot functions)
-    if hasattr(func, 'sql_name'):
-        return func.sql_name().upper()
+    if callable(getattr(cls, 'sql_name', None)):
+        name = cls.sql_name().upper()
     # Try key attribute
-    if hasattr(func, 'key'):
-        return func.key.upper()
+    elif isinstance(getattr(cls, 'key', None), str):
+        name = cls.key.upper()
     # Try name attribute for Anonymous functions
-    if hasattr(func, 'name'):
+    elif hasattr(func, 'name'):
         return func.name.upper()
     # Fallback to class name
-    return type(func).__name__.upper()
+    else:
+        return cls.__name__.upper()
+
+    _FUNCTION_NAMES[cls] = name
+    return name
+
+
+def _expr_name(expr: exp.Expression) -> str:
+    """Column name for a column reference, SQL text for anything else."""
+    if isinstance(expr, exp.Column):
+        return expr.name
+    # Expressions keep their full SQL: the DQ checks group by these names
+    return expr.sql()
 
 
 def _extract_order_columns(order_by: exp.Expression) -> List[str]:
     """Extract column names from ORDER BY clause."""
-    columns = []
-    if hasattr(order_by, 'expressions'):
-        for expr in order_by.expressions:
-            if isinstance(expr, exp.Ordered):
-                col = expr.this
-            else:
-                col = expr
-
-            if isinstance(col, exp.Column):
-                columns.append(col.name)
-            else:
-                columns.append(str(col))
-    return columns
+    return [
+        _expr_name(expr.this if isinstance(expr, exp.Ordered) else expr)
+        for expr in order_by.expressions
+    ]
 
 
 def _extract_partition_columns(window: exp.Window) -> List[str]:
     """Extract column names from PARTITION BY clause."""
-    columns = []
     partition = window.args.get("partition_by")
-    if partition:
-        for expr in partition:
-            if isinstance(expr, exp.Column):
-                columns.append(expr.name)
-            else:
-                columns.append(str(expr))
-    return columns
+    if not partition:
+        return []
+    return [_expr_name(expr) for expr in partition]
 
 
 def _generate_dq_check(func_name: str, window: exp.Window) -> str:
@@ -362,13 +466,19 @@ def suggest_tie_breakers(column_names: List[str]) -> List[str]:
     Returns:
         List of suggested tie-breaker columns in priority order
     """
-    suggestions = []
+    # One bucket per pattern, filled in a single scan over the columns
+    buckets: List[List[str]] = [[] for _ in TIE_BREAKER_PATTERNS]
+    seen: Set[str] = set()
+
+    for col in column_names:
+        if col in seen:
+            continue
+        match = _FUSED_TIE_BREAKERS.match(col)
+        if match:
+            seen.add(col)
+            buckets[match.lastindex - 1].append(col)
 
-    for pattern in TIE_BREAKER_PATTERNS:
-        regex = re.compile(pattern, re.IGNORECASE)
-        for col in column_names:
-            if regex.match(col) and col not in suggestions:
-                suggestions.append(col)
+    suggestions = [col for bucket in buckets for col in bucket]
 
     return suggestions
 
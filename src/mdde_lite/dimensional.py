@@ -21,6 +21,7 @@ This is a simplified version. The full MDDE framework includes:
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Set, Tuple
 from enum import Enum
+from functools import lru_cache
 import re
 
 
@@ -42,7 +43,7 @@ class MeasureType(Enum):
     NON_ADDITIVE = "non_additive"   # Cannot be summed (ratios, averages)
 
 
-@dataclass
+@dataclass(slots=True)
 class Measure:
     """A measure/metric in a fact table."""
     name: str
@@ -52,7 +53,7 @@ class Measure:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DimensionAttribute:
     """An attribute in a dimension table."""
     name: str
@@ -64,7 +65,7 @@ class DimensionAttribute:
     scd_type: int = 1  # 1 or 2
 
 
-@dataclass
+@dataclass(slots=True)
 class DimensionalConstruct:
     """A detected dimensional model construct."""
     name: str
@@ -104,6 +105,80 @@ DIM_PATTERNS = {
     ]
 }
 
+# Each DIM_PATTERNS list fused into one case-insensitive alternation, so a
+# name is tested against a whole category in a single search
+_DIM_REGEXES = {
+    kind: re.compile("|".join(patterns), re.IGNORECASE)
+    for kind, patterns in DIM_PATTERNS.items()
+}
+
+
+def _affixes(patterns: List[str]) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """Split ^x / x$ / .*x$ literal patterns into (prefixes, suffixes)."""
+    prefixes, suffixes = [], []
+    for pattern in patterns:
+        if pattern.startswith("^"):
+            literal, target = pattern[1:], prefixes
+        elif pattern.endswith("$"):
+            literal, target = pattern[2:-1] if pattern.startswith(".*") else pattern[:-1], suffixes
+        else:
+            return None
+        if re.escape(literal) != literal or not literal.isascii():
+            return None
+        target.append(literal.lower())
+    return tuple(prefixes), tuple(suffixes)
+
+
+# Plain (prefixes, suffixes) form of each DIM_PATTERNS category, or None for
+# a category that needs the regex
+_DIM_AFFIXES = {kind: _affixes(patterns) for kind, patterns in DIM_PATTERNS.items()}
+
+
+def _matches_name(name: str, kind: str) -> bool:
+    """Check a lower-cased name against a DIM_PATTERNS category."""
+    affixes = _DIM_AFFIXES[kind]
+    if affixes is None or not name.isascii():
+        # re.IGNORECASE also folds some non-ASCII letters (e.g. "ſ" ~ "s")
+        return _DIM_REGEXES[kind].search(name) is not None
+    prefixes, suffixes = affixes
+    if name.startswith(prefixes):
+        return True
+    # $ also matches just before a trailing newline
+    if name.endswith("\n"):
+        name = name[:-1]
+    return name.endswith(suffixes)
+
+
+# Column name patterns for hierarchy levels
+_HIERARCHY_REGEX = re.compile(
+    "|".join([
+        r".*_level\d*$", r".*_l\d+$", r".*_parent.*", r".*_child.*",
+        r"^level_", r".*_category$", r".*_subcategory$",
+        r".*_group$", r".*_subgroup$"
+    ]),
+    re.IGNORECASE,
+)
+_HIERARCHY_LEVEL = re.compile(r"_l(\d+)$|_level(\d+)$|(\d+)$")
+
+# Name fragments marking non-additive and semi-additive measures
+_NON_ADDITIVE_REGEX = re.compile("ratio|rate|pct|percent|avg")
+_SEMI_ADDITIVE_REGEX = re.compile("balance|inventory|headcount")
+
+# Fixed column lines of generated dimension DDL
+_SCD2_DDL_LINES = (
+    "    valid_from TIMESTAMP NOT NULL,",
+    "    valid_to TIMESTAMP,",
+    "    is_current BOOLEAN DEFAULT TRUE,",
+)
+_AUDIT_DDL_LINES = (
+    "    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,",
+    "    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,",
+)
+
+# Substrings marking a numeric data type ("INT" also covers BIGINT etc.);
+# types come from a small vocabulary, so _is_numeric_type caches per type
+_NUMERIC_TYPE_NAMES = ("INT", "DECIMAL", "NUMERIC", "FLOAT", "DOUBLE", "NUMBER", "REAL")
+
 
 def detect_dimensional_construct(
     table_name: str,
@@ -125,13 +200,13 @@ def detect_dimensional_construct(
     detected_type = DimensionalType.UNKNOWN
     name_confidence = 0.0
 
-    if _matches_pattern(table_lower, DIM_PATTERNS["fact_table"]):
+    if _matches_name(table_lower, "fact_table"):
         detected_type = DimensionalType.FACT
         name_confidence = 0.8
-    elif _matches_pattern(table_lower, DIM_PATTERNS["dimension_table"]):
+    elif _matches_name(table_lower, "dimension_table"):
         detected_type = DimensionalType.DIMENSION
         name_confidence = 0.8
-    elif _matches_pattern(table_lower, DIM_PATTERNS["bridge_table"]):
+    elif _matches_name(table_lower, "bridge_table"):
         detected_type = DimensionalType.BRIDGE
         name_confidence = 0.8
 
@@ -149,12 +224,13 @@ def detect_dimensional_construct(
     fk_count = 0
 
     for col in columns:
-        col_name = col.get("name", "").lower()
-        col_type = col.get("data_type", "").upper()
+        col_name, col_type, is_sk, measure, hierarchy = _classify_column(
+            col.get("name", ""), col.get("data_type", "")
+        )
         is_pk = col.get("is_primary_key", False)
 
         # Detect surrogate key
-        if _matches_pattern(col_name, DIM_PATTERNS["surrogate_key"]):
+        if is_sk:
             sk_count += 1
             if is_pk:
                 surrogate_key = col_name
@@ -165,30 +241,26 @@ def detect_dimensional_construct(
                 fk_count += 1
 
         # Detect measures
-        if _matches_pattern(col_name, DIM_PATTERNS["measure"]) or _is_numeric_type(col_type):
-            if not _matches_pattern(col_name, DIM_PATTERNS["surrogate_key"]):
-                measure_type = _infer_measure_type(col_name)
-                aggregation = _infer_aggregation(col_name)
-
-                measures.append(Measure(
-                    name=col_name,
-                    data_type=col_type,
-                    measure_type=measure_type,
-                    aggregation=aggregation
-                ))
-                measure_count += 1
+        if measure is not None:
+            measure_type, aggregation = measure
+
+            measures.append(Measure(
+                name=col_name,
+                data_type=col_type,
+                measure_type=measure_type,
+                aggregation=aggregation
+            ))
+            measure_count += 1
 
         # Other columns are attributes
-        if not _matches_pattern(col_name, DIM_PATTERNS["surrogate_key"]) and \
-           not _matches_pattern(col_name, DIM_PATTERNS["measure"]):
-            is_hierarchy = _is_hierarchy_column(col_name)
-            hierarchy_level = _get_hierarchy_level(col_name) if is_hierarchy else None
+        if hierarchy is not None:
+            is_hierarchy, hierarchy_level = hierarchy
 
             attributes.append(DimensionAttribute(
                 name=col_name,
                 data_type=col_type,
                 is_surrogate_key=False,
-                is_natural_key=is_pk and not _matches_pattern(col_name, DIM_PATTERNS["surrogate_key"]),
+                is_natural_key=is_pk and not is_sk,
                 is_hierarchy=is_hierarchy,
                 hierarchy_level=hierarchy_level
             ))
@@ -248,36 +320,60 @@ def detect_dimensional_construct(
     )
 
 
-def _matches_pattern(text: str, patterns: List[str]) -> bool:
-    """Check if text matches any pattern."""
-    for pattern in patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    return False
+@lru_cache(maxsize=4096)
+def _classify_column(
+    name: str,
+    data_type: str
+) -> Tuple[str, str, bool, Optional[Tuple[MeasureType, str]], Optional[Tuple[bool, Optional[int]]]]:
+    """
+    Classify a column by name and data type.
+
+    Column names and types repeat heavily across tables (customer_sk,
+    created_at, ...), so the result is cached; detect_dimensional_construct
+    still builds fresh Measure/DimensionAttribute objects from it.
+
+    Returns:
+        (lower-cased name, upper-cased type, is surrogate key,
+        (measure type, aggregation) or None if not a measure,
+        (is hierarchy, hierarchy level) or None if not an attribute)
+    """
+    col_name = name.lower()
+    col_type = data_type.upper()
+
+    # Each column is matched against each category once
+    is_sk = _matches_name(col_name, "surrogate_key")
+    is_measure_name = _matches_name(col_name, "measure")
+
+    measure = None
+    if (is_measure_name or _is_numeric_type(col_type)) and not is_sk:
+        measure = (_infer_measure_type(col_name), _infer_aggregation(col_name))
 
+    hierarchy = None
+    if not is_sk and not is_measure_name:
+        is_hierarchy = _is_hierarchy_column(col_name)
+        hierarchy = (is_hierarchy, _get_hierarchy_level(col_name) if is_hierarchy else None)
 
-def _is_numeric_type(data_type: str) -> bool:
-    """Check if data type is numeric."""
-    numeric_types = ["INT", "DECIMAL", "NUMERIC", "FLOAT", "DOUBLE", "NUMBER", "REAL"]
-    return any(t in data_type.upper() for t in numeric_types)
+    return col_name, col_type, is_sk, measure, hierarchy
 
 
-def _infer_measure_type(col_name: str) -> MeasureType:
-    """Infer measure type from column name."""
-    col_lower = col_name.lower()
+@lru_cache(maxsize=1024)
+def _is_numeric_type(type_upper: str) -> bool:
+    """Check if an upper-cased data type is numeric."""
+    return any(t in type_upper for t in _NUMERIC_TYPE_NAMES)
 
-    if any(x in col_lower for x in ["ratio", "rate", "pct", "percent", "avg"]):
+
+def _infer_measure_type(col_lower: str) -> MeasureType:
+    """Infer measure type from a lower-cased column name."""
+    if _NON_ADDITIVE_REGEX.search(col_lower):
         return MeasureType.NON_ADDITIVE
-    elif any(x in col_lower for x in ["balance", "inventory", "headcount"]):
+    elif _SEMI_ADDITIVE_REGEX.search(col_lower):
         return MeasureType.SEMI_ADDITIVE
     else:
         return MeasureType.ADDITIVE
 
 
-def _infer_aggregation(col_name: str) -> str:
-    """Infer aggregation function from column name."""
-    col_lower = col_name.lower()
-
+def _infer_aggregation(col_lower: str) -> str:
+    """Infer aggregation function from a lower-cased column name."""
     if "count" in col_lower or "cnt" in col_lower:
         return "COUNT"
     elif "avg" in col_lower or "average" in col_lower:
@@ -290,19 +386,14 @@ def _infer_aggregation(col_name: str) -> str:
         return "SUM"
 
 
-def _is_hierarchy_column(col_name: str) -> bool:
-    """Check if column is part of a hierarchy."""
-    hierarchy_patterns = [
-        r".*_level\d*$", r".*_l\d+$", r".*_parent.*", r".*_child.*",
-        r"^level_", r".*_category$", r".*_subcategory$",
-        r".*_group$", r".*_subgroup$"
-    ]
-    return _matches_pattern(col_name, hierarchy_patterns)
+def _is_hierarchy_column(col_lower: str) -> bool:
+    """Check if a lower-cased column name is part of a hierarchy."""
+    return _HIERARCHY_REGEX.search(col_lower) is not None
 
 
-def _get_hierarchy_level(col_name: str) -> int:
-    """Extract hierarchy level from column name."""
-    match = re.search(r"_l(\d+)$|_level(\d+)$|(\d+)$", col_name.lower())
+def _get_hierarchy_level(col_lower: str) -> int:
+    """Extract hierarchy level from a lower-cased column name."""
+    match = _HIERARCHY_LEVEL.search(col_lower)
     if match:
         for g in match.groups():
             if g:
@@ -339,9 +430,14 @@ def generate_star_schema(
         name = entity.get("name", "")
         columns = entity.get("columns", [])
 
-        # Count numeric vs non-numeric columns
-        numeric_cols = [c for c in columns if _is_numeric_type(c.get("data_type", ""))]
-        text_cols = [c for c in columns if not _is_numeric_type(c.get("data_type", ""))]
+        # Split numeric vs non-numeric columns in one pass
+        numeric_cols = []
+        text_cols = []
+        for c in columns:
+            if _is_numeric_type(c.get("data_type", "").upper()):
+                numeric_cols.append(c)
+            else:
+                text_cols.append(c)
 
         # Entities with mostly text columns are dimensions
         if len(text_cols) > len(numeric_cols) and len(text_cols) >= 2:
@@ -366,7 +462,7 @@ def generate_star_schema(
                 fact_measures.append({
                     "name": col["name"],
                     "source": f"{name}.{col['name']}",
-                    "aggregation": _infer_aggregation(col["name"])
+                    "aggregation": _infer_aggregation(col["name"].lower())
                 })
 
     # Build fact table
@@ -407,36 +503,29 @@ def generate_dimension_ddl(
     Returns:
         DDL statement
     """
+    # Surrogate key
+    sk = dimension.surrogate_key or f"{dimension.name.replace('dim_', '')}_sk"
+
     lines = [
         f"-- DIMENSION: {dimension.name}",
         f"-- SCD Type: {scd_type}",
-        f"CREATE TABLE {dimension.name} ("
+        f"CREATE TABLE {dimension.name} (",
+        f"    {sk} INTEGER NOT NULL,",
     ]
 
-    # Surrogate key
-    sk = dimension.surrogate_key or f"{dimension.name.replace('dim_', '')}_sk"
-    lines.append(f"    {sk} INTEGER NOT NULL,")
-
     # Natural key
     if dimension.natural_key:
         lines.append(f"    {dimension.natural_key} VARCHAR NOT NULL,")
 
     # Attributes
-    for attr in dimension.attributes:
-        null = "" if attr.is_natural_key else ""
-        lines.append(f"    {attr.name} {attr.data_type or 'VARCHAR'}{null},")
+    lines += [f"    {attr.name} {attr.data_type or 'VARCHAR'}," for attr in dimension.attributes]
 
     # SCD2 columns
     if scd_type == 2:
-        lines.append("    valid_from TIMESTAMP NOT NULL,")
-        lines.append("    valid_to TIMESTAMP,")
-        lines.append("    is_current BOOLEAN DEFAULT TRUE,")
+        lines += _SCD2_DDL_LINES
 
-    # Audit columns
-    lines.append("    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,")
-    lines.append("    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,")
-
-    # Primary key
+    # Audit columns and primary key
+    lines += _AUDIT_DDL_LINES
     lines.append(f"    PRIMARY KEY ({sk})")
     lines.append(");")
 
@@ -468,15 +557,16 @@ def generate_fact_ddl(
         lines.append(f"    {fact.surrogate_key} INTEGER NOT NULL,")
 
     # Dimension keys
-    for dk in fact.dimension_keys:
-        lines.append(f"    {dk} INTEGER NOT NULL,")
+    lines += [f"    {dk} INTEGER NOT NULL," for dk in fact.dimension_keys]
 
     # Degenerate dimensions (date, etc.)
     lines.append("    transaction_date DATE NOT NULL,")
 
     # Measures
-    for measure in fact.measures:
-        lines.append(f"    {measure.name} {measure.data_type or 'DECIMAL(18,2)'},")
+    lines += [
+        f"    {measure.name} {measure.data_type or 'DECIMAL(18,2)'},"
+        for measure in fact.measures
+    ]
 
     # Audit
     lines.append("    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
@@ -528,10 +618,18 @@ def validate_star_schema(
 
     # Check all FK references exist
     dim_names = {d.name.lower() for d in dimensions}
+    # All names in one string, so each key needs a single substring search;
+    # a key containing the separator could match across two names and is
+    # checked name by name instead
+    all_dim_names = "\0".join(dim_names)
     for dk in fact.dimension_keys:
         # Extract dimension name from key
         dim_name = dk.replace("_sk", "").replace("_key", "")
-        if not any(dim_name in d for d in dim_names):
+        if "\0" in dim_name:
+            matched = any(dim_name in d for d in dim_names)
+        else:
+            matched = bool(dim_names) and dim_name in all_dim_names
+        if not matched:
             report["warnings"].append(
                 f"Dimension key '{dk}' has no matching dimension"
             )
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the package the same way the demos run it: src.mdde_lite
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
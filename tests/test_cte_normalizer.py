@@ -0,0 +1,76 @@
+from src.mdde_lite._parallel import MIN_PARALLEL_BATCH
+from src.mdde_lite.cte_normalizer import (
+    normalize_many,
+    normalize_to_ctes,
+    standardize_cte_names,
+)
+
+
+SQLS = [
+    """
+    SELECT o.order_id, c.customer_name
+    FROM (SELECT order_id, customer_id FROM orders WHERE amount > 0) o
+    JOIN (SELECT customer_id, customer_name FROM customers) c
+      ON o.customer_id = c.customer_id
+    """,
+    "WITH base AS (SELECT * FROM t) SELECT * FROM base",
+    "SELECT * FROM (SELECT * FROM (SELECT a FROM t) x) y",
+    "SELECT a FROM t WHERE a IN (SELECT a FROM u)",
+    "SELECT 1",
+    "SELEC * FROM",
+]
+
+
+def test_normalize_many_matches_serial_normalization():
+    sqls = SQLS * 2
+    expected = [normalize_to_ctes(sql) for sql in sqls]
+
+    # Large enough to go through the process pool
+    assert len(sqls) >= MIN_PARALLEL_BATCH
+    assert normalize_many(sqls, workers=2) == expected
+    assert normalize_many(sqls[:2], workers=2) == expected[:2]
+
+
+def test_standardize_renames_with_list_definitions():
+    sql = "WITH CustData AS (SELECT 1 AS id), OrderData AS (SELECT 2 AS id) SELECT * FROM OrderData"
+    assert standardize_cte_names(sql, prefix="cte_") == (
+        "WITH cte_custdata AS (SELECT 1 AS id), cte_orderdata AS (SELECT 2 AS id) "
+        "SELECT * FROM cte_orderdata"
+    )
+
+
+def test_standardize_renames_cte_to_cte_references():
+    sql = (
+        "WITH CustData AS (SELECT 1 AS id), "
+        "OrderData AS (SELECT CustData.id FROM CustData) "
+        "SELECT OrderData.id FROM OrderData JOIN CustData ON OrderData.id = CustData.id"
+    )
+    assert standardize_cte_names(sql, prefix="cte_") == (
+        "WITH cte_custdata AS (SELECT 1 AS id), "
+        "cte_orderdata AS (SELECT cte_custdata.id FROM cte_custdata) "
+        "SELECT cte_orderdata.id FROM cte_orderdata "
+        "JOIN cte_custdata ON cte_orderdata.id = cte_custdata.id"
+    )
+
+
+def test_standardize_renames_quoted_identifiers():
+    sql = 'WITH "CustData" AS (SELECT 1 AS id) SELECT "CustData".id FROM "CustData"'
+    assert standardize_cte_names(sql, prefix="cte_") == (
+        "WITH cte_custdata AS (SELECT 1 AS id) SELECT cte_custdata.id FROM cte_custdata"
+    )
+
+
+def test_standardize_keeps_qualifiers_of_aliases_shadowing_a_cte():
+    sql = (
+        "WITH CustData AS (SELECT 1 AS id), x AS (SELECT 2 AS id) "
+        "SELECT CustData.id FROM x AS CustData"
+    )
+    assert standardize_cte_names(sql, prefix="cte_") == (
+        "WITH cte_custdata AS (SELECT 1 AS id), cte_x AS (SELECT 2 AS id) "
+        "SELECT CustData.id FROM cte_x AS CustData"
+    )
+
+
+def test_standardize_returns_input_unchanged_without_renames():
+    sql = "WITH cte_base AS (\n  select 1 as id\n)\nselect * from cte_base"
+    assert standardize_cte_names(sql) is sql
@@ -0,0 +1,85 @@
+from src.mdde_lite import datavault
+from src.mdde_lite.datavault import (
+    DVConstructType,
+    _detect_column_role,
+    detect_dv_construct,
+    detect_dv_constructs_batch,
+    generate_dv_ddl,
+    generate_dv_ddl_many,
+)
+
+
+def test_column_role_allows_trailing_newline_like_the_patterns():
+    # $ in DV_PATTERNS matches just before a final newline
+    assert _detect_column_role("customer_bk\n") == "business_key"
+    assert _detect_column_role("ldts\n") == "load_date"
+    assert _detect_column_role("customer_bk\n\n") == "attribute"
+
+
+def test_irregular_table_pattern_falls_back_to_regex(monkeypatch):
+    patterns = dict(datavault.DV_TABLE_PATTERNS)
+    patterns[DVConstructType.PIT] = patterns[DVConstructType.PIT] + [r"^pit\d+_"]
+    monkeypatch.setattr(datavault, "DV_TABLE_PATTERNS", patterns)
+
+    prefixes, suffixes, regexes = datavault._build_table_tokens()
+    assert prefixes["pit"] is DVConstructType.PIT
+    assert [construct_type for construct_type, _ in regexes] == [DVConstructType.PIT]
+    assert regexes[0][1].search("pit2_customer")
+
+
+def test_table_type_allows_trailing_newline_like_the_patterns():
+    construct = detect_dv_construct("customer_hub\n", [])
+    assert construct.construct_type is DVConstructType.HUB
+
+
+def test_generate_dv_ddl_many_matches_joined_ddl(tmp_path):
+    constructs = [
+        detect_dv_construct("hub_customer", [
+            {"name": "hk_customer", "is_primary_key": True},
+            {"name": "customer_bk"},
+            {"name": "load_date"},
+            {"name": "record_source"},
+        ]),
+        detect_dv_construct("link_customer_order", [
+            {"name": "hk_customer_order", "is_primary_key": True},
+            {"name": "hk_customer"},
+            {"name": "hk_order"},
+            {"name": "load_date"},
+        ]),
+        detect_dv_construct("sat_customer", [
+            {"name": "hk_customer"},
+            {"name": "load_date", "is_primary_key": True},
+            {"name": "naam_straße", "data_type": "VARCHAR"},
+        ]),
+    ]
+    output_file = tmp_path / "dv.sql"
+
+    assert generate_dv_ddl_many(constructs, str(output_file)) == 3
+    expected = "\n\n".join(generate_dv_ddl(c) for c in constructs) + "\n"
+    assert output_file.read_text(encoding="utf-8") == expected
+
+
+def test_batch_detection_matches_per_table_detection():
+    tables = [
+        {"name": "hub_customer", "columns": [
+            {"name": "HK_Customer", "data_type": "BINARY", "is_primary_key": True},
+            {"name": "customer_bk"},
+            {"name": "load_date"},
+            {"name": "record_source"},
+        ]},
+        {"name": "sat_customer", "columns": [
+            {"name": "hk_customer"},
+            {"name": "load_date", "is_primary_key": True},
+            {"name": "hash_diff"},
+            {"name": "email", "data_type": "VARCHAR"},
+        ]},
+        {"name": "orders", "columns": [{"name": "order_id"}, {}]},
+        {"columns": []},
+        {"name": "link_customer_order"},
+    ]
+    for strict in (False, True):
+        expected = [
+            detect_dv_construct(table.get("name", ""), table.get("columns", []), strict)
+            for table in tables
+        ]
+        assert detect_dv_constructs_batch(tables, strict) == expected
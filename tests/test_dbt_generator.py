@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.mdde_lite.dbt_generator import generate_dbt_project
+from src.mdde_lite.schema import create_schema
+
+
+@pytest.fixture
+def conn():
+    conn = create_schema(":memory:")
+    conn.execute("""
+        INSERT INTO entity (entity_id, name, description, layer, stereotype)
+        VALUES
+            ('src_customers', 'raw_customers', 'Source customer data', 'source', 'src_external'),
+            ('stg_customers', 'stg_customers', 'Staged customer data', 'staging', 'stg_cleaned'),
+            ('int_customers', 'int_customers', 'Integrated customer data', 'integration', NULL),
+            ('dim_customer', 'dim_customer', 'Customer dimension', 'business', 'dim_scd2')
+    """)
+    conn.execute("""
+        INSERT INTO attribute (attribute_id, entity_id, name, data_type, ordinal_position, is_primary_key)
+        VALUES
+            ('src_cust_id', 'src_customers', 'customer_id', 'INTEGER', 1, TRUE),
+            ('src_cust_name', 'src_customers', 'name', 'VARCHAR', 2, FALSE),
+            ('stg_cust_id', 'stg_customers', 'customer_id', 'INTEGER', 1, TRUE),
+            ('stg_cust_name', 'stg_customers', 'customer_name', 'VARCHAR', 2, FALSE),
+            ('dim_cust_sk', 'dim_customer', 'customer_sk', 'INTEGER', 1, TRUE),
+            ('dim_cust_name', 'dim_customer', 'customer_name', 'VARCHAR', 2, FALSE)
+    """)
+    conn.execute("""
+        INSERT INTO attribute_mapping (mapping_id, target_entity_id, target_attribute_id,
+                                       source_entity_id, source_attribute_id, mapping_type, transformation)
+        VALUES
+            ('map_1', 'stg_customers', 'stg_cust_id', 'src_customers', 'src_cust_id', 'direct', NULL),
+            ('map_2', 'stg_customers', 'stg_cust_name', 'src_customers', 'src_cust_name', 'rename', NULL),
+            ('map_3', 'dim_customer', 'dim_cust_sk', NULL, NULL, 'derived', 'ROW_NUMBER() OVER (ORDER BY customer_id)'),
+            ('map_4', 'dim_customer', 'dim_cust_name', 'stg_customers', 'stg_cust_name', 'direct', NULL)
+    """)
+    yield conn
+    conn.close()
+
+
+def _read_project(output_dir: Path) -> dict:
+    return {
+        path.relative_to(output_dir).as_posix(): path.read_text(encoding="utf-8")
+        for path in sorted(output_dir.rglob("*")) if path.is_file()
+    }
+
+
+def test_cached_generation_matches_uncached(conn, tmp_path):
+    generate_dbt_project(conn, str(tmp_path / "plain"))
+    cache = {}
+    generate_dbt_project(conn, str(tmp_path / "cached"), cache=cache)
+
+    assert sorted(cache) == ["business", "integration", "staging"]
+    assert _read_project(tmp_path / "cached") == _read_project(tmp_path / "plain")
+
+
+def test_cache_is_reused_until_cleared(conn, tmp_path):
+    cache = {}
+    generate_dbt_project(conn, str(tmp_path / "first"), cache=cache)
+    conn.execute("UPDATE entity SET description = 'Changed' WHERE entity_id = 'stg_customers'")
+
+    generate_dbt_project(conn, str(tmp_path / "stale"), cache=cache)
+    assert _read_project(tmp_path / "stale") == _read_project(tmp_path / "first")
+
+    cache.clear()
+    generate_dbt_project(conn, str(tmp_path / "fresh"), cache=cache)
+    assert "Changed" in _read_project(tmp_path / "fresh")["models/staging/schema.yml"]
+
+
+def test_json_schema_format_loads_like_yaml(conn, tmp_path):
+    generate_dbt_project(conn, str(tmp_path / "yaml"))
+    generate_dbt_project(conn, str(tmp_path / "json"), schema_format="json")
+
+    yaml_files = _read_project(tmp_path / "yaml")
+    json_files = _read_project(tmp_path / "json")
+    assert sorted(json_files) == sorted(yaml_files)
+    for name, text in yaml_files.items():
+        if name.endswith(".yml"):
+            assert yaml.safe_load(json_files[name]) == yaml.safe_load(text)
+        else:
+            assert json_files[name] == text
+
+
+def test_unknown_schema_format_is_rejected(conn, tmp_path):
+    with pytest.raises(ValueError):
+        generate_dbt_project(conn, str(tmp_path), schema_format="toml")
+
+
+def test_model_refs_first_mapped_source_in_attribute_order(conn, tmp_path):
+    conn.execute("""
+        INSERT INTO entity (entity_id, name, description, layer, stereotype)
+        VALUES ('fct_orders', 'fct_orders', 'Orders fact', 'business', 'fact')
+    """)
+    # Attribute ids sort opposite to ordinal position, and the first
+    # column's source sorts last, so neither id nor name order gives it
+    conn.execute("""
+        INSERT INTO attribute (attribute_id, entity_id, name, data_type, ordinal_position, is_primary_key)
+        VALUES
+            ('fo_a', 'fct_orders', 'integrated_id', 'INTEGER', 2, FALSE),
+            ('fo_b', 'fct_orders', 'staged_id', 'INTEGER', 1, TRUE)
+    """)
+    conn.execute("""
+        INSERT INTO attribute_mapping (mapping_id, target_entity_id, target_attribute_id,
+                                       source_entity_id, source_attribute_id, mapping_type, transformation)
+        VALUES
+            ('map_fo_a', 'fct_orders', 'fo_a', 'int_customers', 'int_cust_id', 'direct', NULL),
+            ('map_fo_b', 'fct_orders', 'fo_b', 'stg_customers', 'stg_cust_id', 'direct', NULL)
+    """)
+
+    generate_dbt_project(conn, str(tmp_path))
+
+    sql = (tmp_path / "models" / "business" / "fct_orders.sql").read_text(encoding="utf-8")
+    assert "FROM {{ ref('stg_customers') }}" in sql
+    assert "ref('int_customers')" not in sql
@@ -0,0 +1,45 @@
+from src.mdde_lite._parallel import MIN_PARALLEL_BATCH
+from src.mdde_lite.determinism import (
+    check_determinism,
+    check_determinism_batch,
+)
+
+
+def test_returned_issues_are_mutable_copies():
+    sql = "SELECT * FROM orders LIMIT 10"
+    issues = check_determinism(sql)
+    issues[0].tie_breaker_columns.append("order_id")
+    issues[0].severity = "info"
+
+    fresh = check_determinism(sql)
+    assert fresh[0].tie_breaker_columns == ["primary_key", "created_at"]
+    assert fresh[0].severity == "error"
+
+
+def test_invalid_sql_reports_parse_error():
+    # Contains none of the keywords the checks look for
+    issues = check_determinism("SELEC * FROM")
+    assert [issue.issue_type for issue in issues] == ["PARSE_ERROR"]
+    assert issues[0].severity == "error"
+
+
+def test_sql_without_trigger_keywords_is_clean():
+    assert check_determinism("SELECT a, b FROM t WHERE a > 1") == []
+
+
+def test_batch_matches_serial_checks():
+    sqls = [
+        "SELECT ROW_NUMBER() OVER (PARTITION BY region) AS rn FROM customers",
+        "SELECT RANK() OVER (ORDER BY created_date) AS rk FROM customers",
+        "SELECT * FROM orders LIMIT 10",
+        "SELECT DISTINCT status FROM orders LIMIT 5",
+        "SELECT RANDOM(), NOW(), UUID() FROM t",
+        "SELECT a FROM t",
+        "SELEC * FROM",
+    ] * 3
+    expected = [check_determinism(sql) for sql in sqls]
+
+    # Large enough to go through the process pool
+    assert len(sqls) >= MIN_PARALLEL_BATCH
+    assert check_determinism_batch(sqls, workers=2) == expected
+    assert check_determinism_batch(sqls[:3], workers=2) == expected[:3]
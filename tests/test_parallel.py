@@ -0,0 +1,12 @@
+from src.mdde_lite._parallel import MIN_PARALLEL_BATCH, map_in_processes
+
+
+def test_map_in_processes_keeps_input_order():
+    items = list(range(MIN_PARALLEL_BATCH * 5))
+    assert map_in_processes(abs, [-i for i in items], workers=3) == items
+
+
+def test_small_batches_run_in_process():
+    # A lambda cannot be pickled, so this only passes without a pool
+    items = list(range(MIN_PARALLEL_BATCH - 1))
+    assert map_in_processes(lambda i: i * 2, items, workers=4) == [i * 2 for i in items]